@@ -1,38 +1,54 @@
-import getmac
 import homeassistant.helpers.config_validation as cv
-import json
 import logging
-import os
+import re
 import typing
 import voluptuous as vol
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import (CONF_NAME, CONF_FORCE_UPDATE, CONF_HOST, CONF_MAC, Platform, CONF_DOMAIN)
-from homeassistant.core import HomeAssistant
+from datetime import timedelta
+from functools import partial
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import (CONF_NAME, CONF_FORCE_UPDATE, CONF_HOST, CONF_MAC, Platform)
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.service import async_extract_config_entry_ids
+from homeassistant.helpers.typing import ConfigType
 from voluptuous import ALLOW_EXTRA
 
-from .coordinator import SicpUpdateCoordinator
-from pyamasicp.client import Client
+from .bulk import BULK_COMMANDS, BULK_SELECT_SOURCE, BULK_SET_VOLUME, BULK_TURN_OFF, BULK_TURN_ON, \
+    DEFAULT_BULK_CONCURRENCY, DEFAULT_BULK_RETRIES, MAX_BULK_CONCURRENCY, MAX_BULK_RETRIES, async_fan_out
+from .capture import SicpCapture, write_capture
+from .coordinator import SicpUpdateCoordinator, device_info_store
+from .connection import SicpConnection
+from .discovery import get_mac_address
+from .scheduler import SicpPollScheduler
 
 CONF_WOL_TARGET: typing.Final = "wol_target"
 CONF_WOL_PORT: typing.Final = "wol_port"
 CONF_MAX_COUNT = 'maxCount'
 CONF_REFRESH_RATE = 'refreshRate'
+CONF_MIN_REFRESH_RATE = 'minRefreshRate'
+CONF_MAX_REFRESH_RATE = 'maxRefreshRate'
+CONF_HEALTH_REFRESH_RATE = 'healthRefreshRate'
+CONF_CAPTURE = 'capture'
+
+DEFAULT_REFRESH_RATE = 30
+DEFAULT_MIN_REFRESH_RATE = 5
+DEFAULT_MAX_REFRESH_RATE = 300
+DEFAULT_HEALTH_REFRESH_RATE = 300
+
+CAPTURE_WRITE_INTERVAL = timedelta(seconds=10)
 
 _LOGGER = logging.getLogger(__name__)
 _LOGGER.info('Starting iiyama_sicp')
 
-MANIFEST = json.load(open("%s/manifest.json" % os.path.dirname(os.path.realpath(__file__))))
-VERSION = MANIFEST["version"]
-DOMAIN = MANIFEST[CONF_DOMAIN]
-DEFAULT_NAME = MANIFEST[CONF_NAME]
-PLATFORMS = [Platform.MEDIA_PLAYER]
+DOMAIN = "iiyama_sicp"
+PLATFORMS = [Platform.MEDIA_PLAYER, Platform.SENSOR, Platform.BINARY_SENSOR]
 ISSUE_URL = "https://github.com/konikvranik/hacs_iiyama_tv/issues"
 
 SCHEMA = {
     vol.Required(CONF_HOST): cv.string,
     vol.Required(CONF_MAC): cv.string,
     vol.Required(CONF_WOL_TARGET): cv.string,
-    vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
+    vol.Optional(CONF_NAME): cv.string,
     vol.Optional(CONF_FORCE_UPDATE, default=True): cv.boolean,
     vol.Optional(CONF_REFRESH_RATE, default=86400): vol.All(vol.Coerce(int)),
     vol.Optional(CONF_MAX_COUNT, default=5): vol.All(vol.Coerce(int)),
@@ -40,32 +56,159 @@ SCHEMA = {
 
 CONFIG_SCHEMA = vol.Schema({vol.Optional(DOMAIN): vol.Schema(SCHEMA)}, extra=ALLOW_EXTRA)
 
+SERVICE_REFRESH_DEVICE_INFO = "refresh_device_info"
+SERVICE_BULK_COMMAND = "bulk_command"
+
+ATTR_COMMAND = "command"
+ATTR_SOURCE = "source"
+ATTR_VOLUME_LEVEL = "volume_level"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_RETRIES = "retries"
+
+
+def _validate_bulk_command(data: dict) -> dict:
+    if data[ATTR_COMMAND] == BULK_SELECT_SOURCE and ATTR_SOURCE not in data:
+        raise vol.Invalid(f"{ATTR_SOURCE} is required to select a source")
+    if data[ATTR_COMMAND] == BULK_SET_VOLUME and ATTR_VOLUME_LEVEL not in data:
+        raise vol.Invalid(f"{ATTR_VOLUME_LEVEL} is required to set the volume")
+    return data
+
+
+BULK_COMMAND_SCHEMA = vol.All(cv.make_entity_service_schema({
+    vol.Required(ATTR_COMMAND): vol.In(BULK_COMMANDS),
+    vol.Optional(ATTR_SOURCE): cv.string,
+    vol.Optional(ATTR_VOLUME_LEVEL): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+    vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_BULK_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=MAX_BULK_CONCURRENCY)),
+    vol.Optional(ATTR_RETRIES, default=DEFAULT_BULK_RETRIES): vol.All(
+        vol.Coerce(int), vol.Range(min=0, max=MAX_BULK_RETRIES)),
+}), _validate_bulk_command)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration services."""
+
+    async def async_refresh_device_info(call: ServiceCall) -> None:
+        """Re-read model and versions of the targeted displays."""
+        for entry_id in await async_extract_config_entry_ids(hass, call):
+            config_entry = hass.config_entries.async_get_entry(entry_id)
+            if config_entry is None or config_entry.domain != DOMAIN or config_entry.state is not ConfigEntryState.LOADED:
+                continue
+            coordinator_ = config_entry.runtime_data['coordinator']
+            coordinator_.request_device_info_refresh()
+            await coordinator_.async_request_refresh()
+
+    async def async_bulk_command(call: ServiceCall) -> ServiceResponse:
+        """Send one command to all targeted displays concurrently."""
+        actions = {}
+        entries = {}
+        skipped = {}
+        for entry_id in await async_extract_config_entry_ids(hass, call):
+            config_entry = hass.config_entries.async_get_entry(entry_id)
+            if config_entry is None or config_entry.domain != DOMAIN:
+                continue
+            entries[entry_id] = config_entry
+            if config_entry.state is not ConfigEntryState.LOADED:
+                skipped[entry_id] = {"success": False, "skipped": True, "attempts": 0,
+                                     "error": f"not loaded ({config_entry.state.value})"}
+                continue
+            actions[entry_id] = _bulk_action(config_entry, call.data)
+        results = await async_fan_out(actions, call.data[ATTR_CONCURRENCY], call.data[ATTR_RETRIES])
+        return {
+            "succeeded": sum(r["success"] for r in results.values()),
+            "failed": sum(not r["success"] for r in results.values()),
+            "skipped": len(skipped),
+            "results": {entry_id: {"name": entries[entry_id].title, "host": entries[entry_id].data.get(CONF_HOST),
+                                   **result} for entry_id, result in {**results, **skipped}.items()},
+        }
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH_DEVICE_INFO, async_refresh_device_info)
+    hass.services.async_register(DOMAIN, SERVICE_BULK_COMMAND, async_bulk_command, schema=BULK_COMMAND_SCHEMA,
+                                 supports_response=SupportsResponse.OPTIONAL)
+    return True
+
+
+def _bulk_action(config_entry: ConfigEntry, data: dict):
+    """Return the coordinator call sending the bulk command to one display."""
+    coordinator_ = config_entry.runtime_data['coordinator']
+    command = data[ATTR_COMMAND]
+    if command == BULK_TURN_ON:
+        mac = config_entry.data.get(CONF_MAC)
+        return partial(coordinator_.async_turn_on, re.split(r"[\s,;]+", mac) if mac else [],
+                       config_entry.data.get(CONF_WOL_TARGET), config_entry.data.get(CONF_WOL_PORT))
+    if command == BULK_TURN_OFF:
+        return coordinator_.async_turn_off
+    if command == BULK_SELECT_SOURCE:
+        return partial(coordinator_.async_select_source, data[ATTR_SOURCE])
+    return partial(coordinator_.async_set_volume_level, data[ATTR_VOLUME_LEVEL])
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up ESPHome binary sensors based on a config entry."""
 
-    coordinator_ = SicpUpdateCoordinator(hass, config_entry, Client(config_entry.data.get(CONF_HOST), timeout=3))
-    config_entry.runtime_data = {'coordinator': coordinator_}
-    await coordinator_.async_config_entry_first_refresh()
+    config = {**config_entry.data, **config_entry.options}
+    connection = SicpConnection(config_entry.data.get(CONF_HOST), timeout=3)
+    if config.get(CONF_CAPTURE):
+        _setup_capture(hass, config_entry, connection)
+    coordinator_ = SicpUpdateCoordinator(hass, config_entry, connection,
+                                         refresh_rate=config.get(CONF_REFRESH_RATE, DEFAULT_REFRESH_RATE),
+                                         min_refresh_rate=config.get(CONF_MIN_REFRESH_RATE, DEFAULT_MIN_REFRESH_RATE),
+                                         max_refresh_rate=config.get(CONF_MAX_REFRESH_RATE, DEFAULT_MAX_REFRESH_RATE),
+                                         health_refresh_rate=config.get(CONF_HEALTH_REFRESH_RATE,
+                                                                        DEFAULT_HEALTH_REFRESH_RATE))
+    config_entry.runtime_data = {'coordinator': coordinator_, 'options': dict(config_entry.options)}
+    # Entities start from the cached device info; an offline display must not hold up the startup
+    await coordinator_.async_restore()
+
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = SicpPollScheduler(hass)
+    scheduler: SicpPollScheduler = hass.data[DOMAIN]
+    config_entry.async_on_unload(scheduler.async_register(coordinator_))
+    config_entry.async_on_unload(config_entry.add_update_listener(_async_reload_entry))
 
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    # In the background, through the scheduler so no regular poll overlaps it
+    scheduler.async_poll_now(coordinator_)
     return True
 
 
+def _setup_capture(hass: HomeAssistant, config_entry: ConfigEntry, connection: SicpConnection) -> None:
+    """Capture the traffic of the entry to <config>/iiyama_sicp/<entry_id>.sicpcap."""
+    capture = connection.capture = SicpCapture(connection.host)
+    path = hass.config.path(DOMAIN, f"{config_entry.entry_id}.sicpcap")
+
+    async def async_write(_now=None) -> None:
+        if capture.dirty:
+            await hass.async_add_executor_job(write_capture, path, capture.snapshot())
+
+    config_entry.async_on_unload(async_track_time_interval(hass, async_write, CAPTURE_WRITE_INTERVAL,
+                                                           name=f"iiyama SICP capture {config_entry.title}"))
+    config_entry.async_on_unload(async_write)
+
+
+async def _async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Reload the entry after its options changed."""
+    if config_entry.runtime_data['options'] == dict(config_entry.options):
+        return
+    await hass.config_entries.async_reload(config_entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     await config_entry.runtime_data['coordinator'].async_shutdown()
     return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Drop the cached device info of a removed entry."""
+    await device_info_store(hass, config_entry).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migrate old entry."""
     data = {**config_entry.data}
     if not (CONF_MAC in data and data[CONF_MAC]):
-        from functools import partial
-        mac = await hass.async_add_executor_job(
-            partial(getmac.get_mac_address, ip=data[CONF_HOST], hostname=data[CONF_HOST])
-        )
+        mac = await hass.async_add_executor_job(get_mac_address, data[CONF_HOST])
         data[CONF_MAC] = mac
         hass.config_entries.async_update_entry(config_entry, data=data, minor_version=1, version=1)
     return True
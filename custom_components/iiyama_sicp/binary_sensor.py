@@ -0,0 +1,65 @@
+"""Health binary sensors of the iiyama SICP integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_MAC, EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import SicpUpdateCoordinator
+from .coordinator import SicpData
+from .profiles import READ_SIGNAL
+
+
+@dataclass(frozen=True, kw_only=True)
+class SicpBinarySensorEntityDescription(BinarySensorEntityDescription):
+    # Coordinator read polled for this sensor
+    read: str
+    value_fn: Callable[[SicpData], bool | None]
+
+
+BINARY_SENSORS = (
+    SicpBinarySensorEntityDescription(
+        key="signal",
+        translation_key="signal",
+        read=READ_SIGNAL,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.signal_present,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry,
+                            async_add_entities: AddEntitiesCallback) -> None:
+    """Set up the binary sensors of a config entry."""
+    coordinator = config_entry.runtime_data['coordinator']
+    device_info = coordinator.device_info
+    unique_prefix = f"iiyama_sicp_{config_entry.data.get(CONF_HOST)}_{config_entry.data.get(CONF_MAC)}"
+    async_add_entities([IiyamaSicpBinarySensor(coordinator, description, device_info, unique_prefix)
+                        for description in BINARY_SENSORS if coordinator.profile.supports(description.read)])
+
+
+class IiyamaSicpBinarySensor(CoordinatorEntity[SicpUpdateCoordinator], BinarySensorEntity):
+    """Health state of a display, read by the coordinator only while this sensor is enabled."""
+
+    _attr_has_entity_name = True
+
+    entity_description: SicpBinarySensorEntityDescription
+
+    def __init__(self, coordinator: SicpUpdateCoordinator, description: SicpBinarySensorEntityDescription,
+                 device_info: DeviceInfo, unique_prefix: str) -> None:
+        super().__init__(coordinator, context=(description.read,))
+        self.entity_description = description
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{unique_prefix}_{description.key}"
+
+    @property
+    def is_on(self) -> bool | None:
+        data = self.coordinator.data
+        return self.entity_description.value_fn(data) if data else None
@@ -0,0 +1,56 @@
+"""Fan-out of one command to many displays."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .sicp import SicpCommandRejected, SicpCommandUnsupported, SicpError
+from .wol import WakeTimeoutError
+
+_LOGGER = logging.getLogger(__name__)
+
+BULK_TURN_ON = "turn_on"
+BULK_TURN_OFF = "turn_off"
+BULK_SELECT_SOURCE = "select_source"
+BULK_SET_VOLUME = "set_volume"
+BULK_COMMANDS = (BULK_TURN_ON, BULK_TURN_OFF, BULK_SELECT_SOURCE, BULK_SET_VOLUME)
+
+DEFAULT_BULK_CONCURRENCY = 16
+MAX_BULK_CONCURRENCY = 64
+DEFAULT_BULK_RETRIES = 2
+MAX_BULK_RETRIES = 5
+# Delay before the first retry, doubled for every further one
+BULK_RETRY_DELAY = 1.0
+
+
+async def async_fan_out(actions: dict[str, Callable[[], Awaitable[Any]]], concurrency: int = DEFAULT_BULK_CONCURRENCY,
+                        retries: int = DEFAULT_BULK_RETRIES) -> dict[str, dict[str, Any]]:
+    """Run every action with at most `concurrency` at once and return the result per key.
+
+    Network failures are retried up to `retries` times with backoff; a
+    command the display refuses or its model does not support, a display
+    that already failed to wake up, or any other error, is not retried.
+    A waiting retry does not hold a concurrency slot.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key: str, action: Callable[[], Awaitable[Any]]) -> dict[str, Any]:
+        for attempt in range(1, retries + 2):
+            try:
+                async with semaphore:
+                    await action()
+                return {"success": True, "attempts": attempt}
+            except (SicpCommandRejected, SicpCommandUnsupported, WakeTimeoutError) as e:
+                return {"success": False, "attempts": attempt, "error": str(e)}
+            except (OSError, SicpError) as e:
+                _LOGGER.debug("Attempt %d of a bulk command to %s failed: %s", attempt, key, e)
+                if attempt > retries:
+                    return {"success": False, "attempts": attempt, "error": str(e) or type(e).__name__}
+            except Exception as e:
+                return {"success": False, "attempts": attempt, "error": str(e) or type(e).__name__}
+            await asyncio.sleep(BULK_RETRY_DELAY * 2 ** (attempt - 1))
+
+    results = await asyncio.gather(*(run(key, action) for key, action in actions.items()))
+    return dict(zip(actions, results))
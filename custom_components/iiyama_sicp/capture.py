@@ -0,0 +1,79 @@
+"""Compact capture of the SICP frames exchanged with a display.
+
+Frames are kept in a ring buffer bounded by size and written to disk as
+a whole from the executor, so the file always holds the most recent
+traffic. A capture file starts with MAGIC and the display's host, then
+holds records of a timestamp, a direction and the raw frame.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+
+MAGIC = b"SICPCAP\x01"
+DIRECTION_SENT = 0
+DIRECTION_RECEIVED = 1
+DEFAULT_CAPTURE_SIZE = 256 * 1024
+
+# Unix time, direction, frame length
+_RECORD = struct.Struct("<dBH")
+
+
+@dataclass(frozen=True)
+class CaptureRecord:
+    timestamp: float
+    direction: int
+    frame: bytes
+
+
+class SicpCapture:
+    """Ring buffer of the last `max_bytes` of captured frames of one display."""
+
+    def __init__(self, host: str, max_bytes: int = DEFAULT_CAPTURE_SIZE):
+        self.host = host
+        self._max_bytes = max_bytes
+        self._records: deque[bytes] = deque()
+        self._size = 0
+        self.dirty = False
+
+    def record(self, direction: int, frame: bytes):
+        entry = _RECORD.pack(time.time(), direction, len(frame)) + frame
+        self._records.append(entry)
+        self._size += len(entry)
+        while self._size > self._max_bytes:
+            self._size -= len(self._records.popleft())
+        self.dirty = True
+
+    def snapshot(self) -> bytes:
+        """Return the file content of the current buffer and mark it as written."""
+        self.dirty = False
+        host = self.host.encode()
+        return MAGIC + bytes([len(host)]) + host + b''.join(self._records)
+
+
+def write_capture(path: str, content: bytes):
+    """Replace the capture file at `path`; blocking, run it in the executor."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(content)
+    os.replace(f"{path}.tmp", path)
+
+
+def read_capture(path: str) -> tuple[str, list[CaptureRecord]]:
+    """Return the host and the records of a capture file."""
+    with open(path, "rb") as f:
+        content = f.read()
+    if not content.startswith(MAGIC):
+        raise ValueError(f"{path} is not a SICP capture")
+    offset = len(MAGIC) + 1 + content[len(MAGIC)]
+    host = content[len(MAGIC) + 1:offset].decode()
+    records = []
+    while offset + _RECORD.size <= len(content):
+        timestamp, direction, length = _RECORD.unpack_from(content, offset)
+        offset += _RECORD.size
+        records.append(CaptureRecord(timestamp, direction, content[offset:offset + length]))
+        offset += length
+    return host, records
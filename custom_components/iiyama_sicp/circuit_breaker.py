@@ -0,0 +1,76 @@
+"""Per-display circuit breaker pausing polls of unreachable displays."""
+from __future__ import annotations
+
+from datetime import timedelta
+
+DEFAULT_FAILURE_THRESHOLD = 3
+PROBE_BACKOFF_MIN = timedelta(seconds=10)
+PROBE_BACKOFF_MAX = timedelta(minutes=10)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class SicpCircuitBreaker:
+    """Track consecutive poll failures of one display.
+
+    The breaker opens after `threshold` failures in a row. While open, polls
+    are replaced by a bare TCP connect every `probe_interval`, which doubles
+    after every failed probe. A successful probe half-opens the breaker and
+    lets one full poll through; it closes on success and re-opens right away
+    on failure.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_FAILURE_THRESHOLD, backoff_min: timedelta = PROBE_BACKOFF_MIN,
+                 backoff_max: timedelta = PROBE_BACKOFF_MAX):
+        self._threshold = threshold
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.probe_interval = backoff_min
+        self.opened = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == STATE_OPEN
+
+    def record_success(self) -> bool:
+        """Close the breaker; returns whether it was not closed before."""
+        was_tripped = self.state != STATE_CLOSED
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.probe_interval = self._backoff_min
+        return was_tripped
+
+    def record_failure(self) -> bool:
+        """Count a failed poll; returns whether this opened the breaker."""
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+            self._increase_backoff()
+            return False
+        if self.state == STATE_CLOSED and self.failures >= self._threshold:
+            self.state = STATE_OPEN
+            self.opened += 1
+            return True
+        return False
+
+    def record_probe(self, success: bool):
+        """Half-open the breaker after a successful probe, back off otherwise."""
+        if success:
+            self.state = STATE_HALF_OPEN
+        else:
+            self._increase_backoff()
+
+    def _increase_backoff(self):
+        self.probe_interval = min(self.probe_interval * 2, self._backoff_max)
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "probe_interval_s": self.probe_interval.total_seconds(),
+            "opened": self.opened,
+        }
@@ -0,0 +1,91 @@
+"""Per-display command queue with latest-wins coalescing."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+COMMAND_POWER = "power"
+COMMAND_SOURCE = "source"
+COMMAND_VOLUME = "volume"
+
+
+class SicpCommandQueue:
+    """Send commands one after another, merging superseded ones.
+
+    Commands are keyed by kind (power, source, volume). A command submitted
+    while another of the same kind is still waiting replaces its value, so
+    only the latest value is sent; both submitters are resolved by that one
+    send. The replacement takes the place of the latest submission, so
+    commands keep the order in which they were last submitted. Once the queue drains, `on_idle` runs once for the whole burst
+    with the kinds of commands that were sent successfully.
+    """
+
+    def __init__(self, send: Callable[[str, Any], Awaitable[None]],
+                 on_idle: Callable[[set[str]], Awaitable[None]]):
+        self._send = send
+        self._on_idle = on_idle
+        self._pending: dict[str, tuple[Any, list[asyncio.Future]]] = {}
+        self._worker: asyncio.Task | None = None
+        # Submitters waiting for the command being sent right now
+        self._in_flight: list[asyncio.Future] = []
+        self.submitted = 0
+        self.sent = 0
+
+    async def async_submit(self, kind: str, value: Any) -> None:
+        """Queue a command and wait until it (or its replacement) was sent."""
+        future = asyncio.get_running_loop().create_future()
+        self.submitted += 1
+        if kind in self._pending:
+            # Popped so the replacement is sent after the commands submitted in between
+            _, futures = self._pending.pop(kind)
+            _LOGGER.debug("Coalescing %s command, %s supersedes previous value", kind, value)
+        else:
+            futures = []
+        futures.append(future)
+        self._pending[kind] = (value, futures)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        await future
+
+    async def _run(self):
+        # Commands submitted while on_idle runs are sent by this same worker
+        while self._pending:
+            sent = set()
+            while self._pending:
+                kind = next(iter(self._pending))
+                value, self._in_flight = self._pending.pop(kind)
+                try:
+                    self.sent += 1
+                    await self._send(kind, value)
+                except Exception as e:
+                    for future in self._in_flight:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    sent.add(kind)
+                    for future in self._in_flight:
+                        if not future.done():
+                            future.set_result(None)
+                self._in_flight = []
+            if not sent:
+                continue
+            try:
+                await self._on_idle(sent)
+            except Exception as e:
+                _LOGGER.debug("Confirming %s failed: %s", sent, e)
+
+    def cancel(self):
+        """Drop waiting commands and stop the worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+        for future in self._in_flight:
+            future.cancel()
+        self._in_flight = []
+        for _, futures in self._pending.values():
+            for future in futures:
+                future.cancel()
+        self._pending.clear()
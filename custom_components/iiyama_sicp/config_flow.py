@@ -4,15 +4,36 @@ from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
+import homeassistant.helpers.config_validation as cv
 from homeassistant.const import CONF_NAME, CONF_HOST, CONF_BASE, \
-    CONF_MAC
-from homeassistant.core import callback
+    CONF_MAC, CONF_HOSTS
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.loader import async_get_integration
 from voluptuous import UNDEFINED
 
-from . import DOMAIN, DEFAULT_NAME, VERSION, CONF_WOL_TARGET, CONF_WOL_PORT
+from . import DOMAIN, CONF_WOL_TARGET, CONF_WOL_PORT, CONF_REFRESH_RATE, \
+    CONF_MIN_REFRESH_RATE, CONF_MAX_REFRESH_RATE, DEFAULT_REFRESH_RATE, DEFAULT_MIN_REFRESH_RATE, \
+    DEFAULT_MAX_REFRESH_RATE, CONF_HEALTH_REFRESH_RATE, DEFAULT_HEALTH_REFRESH_RATE, CONF_CAPTURE
+from .discovery import DiscoveredDisplay, async_scan, parse_network
 
 _LOGGER = logging.getLogger(__name__)
 
+CONF_SUBNET = "subnet"
+
+
+async def _default_name(hass: HomeAssistant) -> str:
+    """Return the name from the manifest, loaded along with the integration."""
+    return (await async_get_integration(hass, DOMAIN)).name
+
+
+def _discovered_data(display: DiscoveredDisplay, default_name: str) -> dict[str, Any]:
+    return {
+        CONF_HOST: display.host,
+        CONF_NAME: display.model_id or default_name,
+        CONF_MAC: display.mac or "",
+        CONF_WOL_TARGET: display.broadcast_address,
+    }
+
 
 async def _show_form(self, step, user_input):
     """Configure the form."""
@@ -20,7 +41,8 @@ async def _show_form(self, step, user_input):
         vol.Optional(CONF_HOST,
                      default=user_input[CONF_HOST] if user_input and (CONF_HOST in user_input) else UNDEFINED): str,
         vol.Optional(CONF_NAME,
-                     default=user_input[CONF_NAME] if user_input and (CONF_NAME in user_input) else DEFAULT_NAME): str,
+                     default=user_input[CONF_NAME] if user_input and (CONF_NAME in user_input) else
+                     await _default_name(self.hass)): str,
         vol.Optional(CONF_MAC,
                      default=user_input[CONF_MAC] if user_input and (CONF_MAC in user_input) else UNDEFINED): str,
         vol.Optional(CONF_WOL_TARGET,
@@ -29,6 +51,21 @@ async def _show_form(self, step, user_input):
         vol.Optional(CONF_WOL_PORT,
                      default=user_input[CONF_WOL_PORT] if user_input and (
                                  CONF_WOL_PORT in user_input) else UNDEFINED): int,
+        vol.Optional(CONF_REFRESH_RATE,
+                     default=user_input[CONF_REFRESH_RATE] if user_input and (
+                                 CONF_REFRESH_RATE in user_input) else DEFAULT_REFRESH_RATE): int,
+        vol.Optional(CONF_MIN_REFRESH_RATE,
+                     default=user_input[CONF_MIN_REFRESH_RATE] if user_input and (
+                                 CONF_MIN_REFRESH_RATE in user_input) else DEFAULT_MIN_REFRESH_RATE): int,
+        vol.Optional(CONF_MAX_REFRESH_RATE,
+                     default=user_input[CONF_MAX_REFRESH_RATE] if user_input and (
+                                 CONF_MAX_REFRESH_RATE in user_input) else DEFAULT_MAX_REFRESH_RATE): int,
+        vol.Optional(CONF_HEALTH_REFRESH_RATE,
+                     default=user_input[CONF_HEALTH_REFRESH_RATE] if user_input and (
+                                 CONF_HEALTH_REFRESH_RATE in user_input) else DEFAULT_HEALTH_REFRESH_RATE): int,
+        vol.Optional(CONF_CAPTURE,
+                     default=user_input[CONF_CAPTURE] if user_input and (
+                                 CONF_CAPTURE in user_input) else False): bool,
     }
     return self.async_show_form(step_id=step, data_schema=(vol.Schema(
         options)), errors=self._errors)
@@ -38,15 +75,20 @@ async def _show_form(self, step, user_input):
 class HDOFlowHandler(config_entries.ConfigFlow):
     """Config flow for iiyama sicp integration."""
 
-    VERSION = VERSION
+    VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_PUSH
 
     def __init__(self):
         """Initialize."""
         self._errors = {}
         self._data = {}
+        self._discovered = {}
+
+    async def async_step_user(self, user_input=None):
+        """Let the user choose between manual setup and a network scan."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "discover"])
 
-    async def async_step_user(self, user_input={}):  # pylint: disable=dangerous-default-value
+    async def async_step_manual(self, user_input={}):  # pylint: disable=dangerous-default-value
         """Display the form, then store values and create entry."""
         self._errors = {}
         if user_input is not None:
@@ -57,7 +99,63 @@ class HDOFlowHandler(config_entries.ConfigFlow):
                 return self.async_create_entry(title=self._data[CONF_HOST], data=self._data)
             else:
                 self._errors[CONF_BASE] = CONF_HOST
-        return await _show_form(self, "user", self._data)
+        return await _show_form(self, "manual", self._data)
+
+    async def async_step_discover(self, user_input=None):
+        """Scan a subnet for displays answering SICP."""
+        self._errors = {}
+        if user_input is not None:
+            try:
+                network = parse_network(user_input[CONF_SUBNET])
+            except ValueError:
+                self._errors[CONF_SUBNET] = "invalid_subnet"
+            else:
+                configured = self._async_current_ids()
+                self._discovered = {d.host: d for d in await async_scan(self.hass, network)
+                                    if d.host not in configured}
+                if self._discovered:
+                    return await self.async_step_pick()
+                self._errors[CONF_BASE] = "no_devices_found"
+        return self.async_show_form(step_id="discover", data_schema=vol.Schema({
+            vol.Required(CONF_SUBNET, default=user_input[CONF_SUBNET] if user_input else UNDEFINED): str,
+        }), errors=self._errors)
+
+    async def async_step_pick(self, user_input=None):
+        """Add the first selected display; the others are offered as discovered displays."""
+        self._errors = {}
+        if user_input is not None:
+            default_name = await _default_name(self.hass)
+            selected = [_discovered_data(self._discovered[host], default_name) for host in user_input[CONF_HOSTS]]
+            if selected:
+                for data in selected[1:]:
+                    self.hass.async_create_task(self.hass.config_entries.flow.async_init(
+                        DOMAIN, context={"source": config_entries.SOURCE_INTEGRATION_DISCOVERY}, data=data))
+                await self.async_set_unique_id(selected[0][CONF_HOST])
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(title=selected[0][CONF_HOST], data=selected[0])
+            self._errors[CONF_BASE] = "no_devices_selected"
+        default_name = await _default_name(self.hass)
+        hosts = {host: f"{d.model_id or default_name} ({host})" for host, d in self._discovered.items()}
+        return self.async_show_form(step_id="pick", data_schema=vol.Schema({
+            vol.Required(CONF_HOSTS, default=list(hosts)): cv.multi_select(hosts),
+        }), errors=self._errors)
+
+    async def async_step_integration_discovery(self, discovery_info):
+        """Handle a display found by a network scan."""
+        await self.async_set_unique_id(discovery_info[CONF_HOST])
+        self._abort_if_unique_id_configured()
+        self._data = discovery_info
+        self.context["title_placeholders"] = {CONF_NAME: discovery_info[CONF_NAME],
+                                              CONF_HOST: discovery_info[CONF_HOST]}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(self, user_input=None):
+        """Confirm adding a discovered display."""
+        if user_input is not None:
+            return self.async_create_entry(title=self._data[CONF_HOST], data=self._data)
+        self._set_confirm_only()
+        return self.async_show_form(step_id="discovery_confirm",
+                                    description_placeholders=self.context["title_placeholders"])
 
     async def async_step_reconfigure(self, user_input: dict[str, Any] | None = None):
         config_entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
@@ -98,7 +196,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_create_entry(title=self._data[CONF_NAME], data=self._data)
         else:
             if user_input is None:
-                user_input = self.config_entry.data
+                user_input = {**self.config_entry.data, **self.config_entry.options}
             self._data.update(user_input)
             return await _show_form(self, "init", user_input)
 
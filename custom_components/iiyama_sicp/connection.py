@@ -0,0 +1,262 @@
+"""Persistent per-display SICP connection."""
+from __future__ import annotations
+
+import asyncio
+import binascii
+import logging
+from collections import deque
+from collections.abc import Callable
+
+from .capture import DIRECTION_RECEIVED, DIRECTION_SENT, SicpCapture
+from .sicp import (CMD_ACK, CMD_GET_POWER_STATE, DEFAULT_MONITOR_ID, SICP_PORT, SicpCommandRejected, SicpError,
+                   SicpFrame, check_reply, decode_frame, encode_frame, read_raw_frame)
+from .stats import SicpStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requests written ahead of their replies; SICP answers strictly in order
+DEFAULT_PIPELINE_DEPTH = 3
+RECONNECT_BACKOFF_MIN = 0.5
+RECONNECT_BACKOFF_MAX = 60.0
+# Query sent on an otherwise idle link, keeping it (and the reports it carries) open
+DEFAULT_KEEPALIVE_INTERVAL = 15.0
+
+
+class SicpConnection:
+    """One long-lived socket to a display with ordered, pipelined requests.
+
+    Requests are written in the order `send` is called and replies are
+    matched to them first-in first-out. The link is dropped when it dies
+    (EOF, garbage, missing reply) and re-established by the next request;
+    failed connection attempts back off exponentially.
+
+    Frames the display sends on its own, e.g. a status report after a
+    change made with the remote, are passed to the push listeners. So is
+    the reply to the power state query sent as a keep-alive whenever the
+    link was idle for `keepalive_interval` seconds; the owner adjusts it
+    with `set_keepalive_interval`.
+    """
+
+    def __init__(self, host: str, port: int = SICP_PORT, monitor_id: int = DEFAULT_MONITOR_ID,
+                 timeout: float = 3, pipeline_depth: int = DEFAULT_PIPELINE_DEPTH,
+                 keepalive_interval: float | None = DEFAULT_KEEPALIVE_INTERVAL):
+        self.host = host
+        self.port = port
+        self.monitor_id = monitor_id
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(pipeline_depth)
+        self._lock = asyncio.Lock()
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._keepalive_task: asyncio.Task | None = None
+        self._keepalive_interval = keepalive_interval
+        self._last_write = 0.0
+        self._push_listeners: list[Callable[[SicpFrame], None]] = []
+        self._pushing = False
+        self._pending: deque[tuple[int, asyncio.Future]] = deque()
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._closed = False
+        self.connects = 0
+        self.reuses = 0
+        self.requests = 0
+        self.link_failures = 0
+        self.pushed = 0
+        self.stats = SicpStats()
+        # Records every frame sent and received when set
+        self.capture: SicpCapture | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def push_active(self) -> bool:
+        """Return if the display reported a status change on its own over the current link."""
+        return self._pushing and self._writer is not None
+
+    @property
+    def counters(self) -> dict[str, int]:
+        return {
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "requests": self.requests,
+            "link_failures": self.link_failures,
+            "reconnects": self.reconnects,
+            "pushed": self.pushed,
+        }
+
+    @property
+    def reconnects(self) -> int:
+        return max(self.connects - 1, 0)
+
+    def add_push_listener(self, listener: Callable[[SicpFrame], None]) -> Callable[[], None]:
+        """Call `listener` with every status frame the display sends unasked; returns a remover."""
+        self._push_listeners.append(listener)
+        return lambda: self._push_listeners.remove(listener)
+
+    def set_keepalive_interval(self, interval: float | None):
+        """Change how long the link may idle before a keep-alive query, None to send none."""
+        if interval == self._keepalive_interval:
+            return
+        self._keepalive_interval = interval
+        if self._writer is None:
+            return
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if interval:
+            self._keepalive_task = asyncio.get_running_loop().create_task(self._keepalive_loop())
+
+    def reset_backoff(self):
+        """Allow an immediate reconnect, e.g. once the display is known to be up."""
+        self._backoff = 0.0
+        self._retry_at = 0.0
+
+    async def send(self, command: int, data: bytes = b'') -> bytes:
+        """Queue one command and return the payload of its reply."""
+        try:
+            return await self._send(command, data)
+        except TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        except OSError:
+            self.stats.socket_errors += 1
+            raise
+        except SicpCommandRejected:
+            self.stats.rejected += 1
+            raise
+
+    async def _send(self, command: int, data: bytes) -> bytes:
+        message = encode_frame(self.monitor_id, command, data)
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            async with self._lock:
+                await self._ensure_connected()
+                future = loop.create_future()
+                self._pending.append((command, future))
+                self.requests += 1
+                _LOGGER.debug("%s request: %s", self.host, binascii.hexlify(message))
+                self._writer.write(message)
+                if self.capture is not None:
+                    self.capture.record(DIRECTION_SENT, message)
+                sent_at = self._last_write = loop.time()
+            expire = loop.call_later(self._timeout, self._expire, future)
+            try:
+                frame: SicpFrame = await future
+            finally:
+                expire.cancel()
+        self.stats.record(command, loop.time() - sent_at)
+        return check_reply(self.monitor_id, command, frame)
+
+    async def _ensure_connected(self):
+        if self._closed:
+            raise ConnectionError(f"Connection to {self.host} is closed")
+        if self._writer is not None:
+            self.reuses += 1
+            return
+        loop = asyncio.get_running_loop()
+        if loop.time() < self._retry_at:
+            raise ConnectionError(f"{self.host} unreachable, next attempt in {self._retry_at - loop.time():.1f}s")
+        try:
+            async with asyncio.timeout(self._timeout):
+                reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        except OSError:
+            self._backoff = min(max(self._backoff * 2, RECONNECT_BACKOFF_MIN), RECONNECT_BACKOFF_MAX)
+            self._retry_at = loop.time() + self._backoff
+            raise
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self.connects += 1
+        self._pushing = False
+        _LOGGER.debug("%s connected (%d)", self.host, self.connects)
+        self._reader_task = loop.create_task(self._read_loop(reader))
+        if self._keepalive_interval:
+            self._keepalive_task = loop.create_task(self._keepalive_loop())
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        try:
+            while True:
+                raw = await read_raw_frame(reader)
+                if self.capture is not None:
+                    self.capture.record(DIRECTION_RECEIVED, raw)
+                frame = decode_frame(raw)
+                _LOGGER.debug("%s reply: 0x%02x %s", self.host, frame.command, binascii.hexlify(frame.data))
+                # Replies carry the command of their request, or ACK for set commands
+                if not self._pending or frame.command not in (CMD_ACK, self._pending[0][0]):
+                    # A report of a value a later request is waiting for is applied, but it may as well be
+                    # that request's reply, so it does not prove the display pushes on its own
+                    self._push(frame, unsolicited=all(command != frame.command for command, _ in self._pending))
+                    continue
+                _, future = self._pending.popleft()
+                if not future.done():
+                    future.set_result(frame)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.IncompleteReadError:
+            self._drop(ConnectionError(f"{self.host} closed the connection"))
+        except (OSError, SicpError) as e:
+            self._drop(e)
+
+    def _push(self, frame: SicpFrame, unsolicited: bool = True):
+        if frame.command == CMD_ACK or frame.monitor_id != self.monitor_id:
+            _LOGGER.debug("%s sent an unsolicited frame", self.host)
+            return
+        self.pushed += 1
+        if unsolicited:
+            self._pushing = True
+        for listener in list(self._push_listeners):
+            listener(frame)
+
+    async def _keepalive_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(max(self._last_write + self._keepalive_interval - loop.time(), 0.0))
+            if loop.time() - self._last_write < self._keepalive_interval:
+                continue
+            try:
+                data = await self.send(CMD_GET_POWER_STATE)
+            except SicpCommandRejected as e:
+                _LOGGER.debug("%s", e)
+                continue
+            except (OSError, SicpError) as e:
+                # The link is dropped and this task cancelled by the failed request
+                _LOGGER.debug("%s keep-alive failed: %s", self.host, e)
+                return
+            for listener in list(self._push_listeners):
+                listener(SicpFrame(self.monitor_id, CMD_GET_POWER_STATE, data))
+
+    def _expire(self, future: asyncio.Future):
+        if not future.done():
+            self._drop(TimeoutError(f"No reply from {self.host} within {self._timeout}s"))
+
+    def _drop(self, error: Exception, failure: bool = True):
+        """Forget the current link and fail every request still waiting on it."""
+        if self._writer is None:
+            return
+        _LOGGER.debug("%s link dropped: %s", self.host, error)
+        if failure:
+            self.link_failures += 1
+        self._writer.close()
+        self._writer = None
+        if self._reader_task is not None and self._reader_task is not asyncio.current_task():
+            self._reader_task.cancel()
+        self._reader_task = None
+        if self._keepalive_task is not None and self._keepalive_task is not asyncio.current_task():
+            self._keepalive_task.cancel()
+        self._keepalive_task = None
+        while self._pending:
+            _, future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    async def close(self):
+        """Close the link; further requests fail."""
+        self._closed = True
+        writer = self._writer
+        self._drop(ConnectionError(f"Connection to {self.host} is closed"), failure=False)
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
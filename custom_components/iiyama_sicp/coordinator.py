@@ -1,25 +1,68 @@
 from __future__ import annotations
 
-import async_timeout
 import asyncio
-import getmac
 import logging
 import socket
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
 from datetime import timedelta
-from functools import partial
+from time import monotonic
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_MAC, CONF_HOST
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from pyamasicp.client import Client
-from pyamasicp.commands import INPUT_SOURCES, Commands
+from .circuit_breaker import SicpCircuitBreaker
+from .command_queue import COMMAND_POWER, COMMAND_SOURCE, COMMAND_VOLUME, SicpCommandQueue
+from .connection import DEFAULT_KEEPALIVE_INTERVAL, SicpConnection
+from .discovery import get_mac_address
+from .profiles import (READ_BACKLIGHT, READ_OPERATING_HOURS, READ_POWER, READ_SIGNAL, READ_SOURCE, READ_TEMPERATURE,
+                       READ_VOLUME, SicpModelProfile, profile_for_model)
+from .sicp import (CMD_GET_INPUT_SOURCE, CMD_GET_POWER_STATE, CMD_GET_VOLUME, REPLY_NAV, SicpCommandRejected,
+                   SicpCommands, SicpCommandUnsupported, SicpFrame, decode_byte, decode_power_state)
+from .wol import WakeTimeoutError, async_probe_port, async_wait_until_ready, async_wake
 
 _LOGGER = logging.getLogger(__name__)
 
+# Poll at the shortest interval for this long after a command or a state change
+ACTIVITY_WINDOW = timedelta(seconds=60)
+# Changes of these are user activity; health values drifting are not
+ACTIVITY_FIELDS = ("state", "input_source", "volume_level")
+# Poll at the longest interval once the panel has been off or unreachable this long
+IDLE_AFTER = timedelta(minutes=10)
 
-@dataclass
+# How long a display woken over LAN may take to accept SICP connections
+POWER_ON_TIMEOUT = timedelta(seconds=60)
+
+DEVICE_INFO_STORAGE_VERSION = 1
+DEVICE_INFO_FIELDS = ("model_id", "model", "hw_version", "sw_version")
+DEVICE_INFO_RETRY_MIN = timedelta(minutes=1)
+DEVICE_INFO_RETRY_MAX = timedelta(hours=6)
+# Sources and reads the display answered with NAV while on, stored with the device info of its model
+REFUSED_SOURCES = "refused_sources"
+REFUSED_READS = "refused_reads"
+
+_COMMAND_READS = {COMMAND_POWER: READ_POWER, COMMAND_SOURCE: READ_SOURCE, COMMAND_VOLUME: READ_VOLUME}
+# Status frames the display pushes, or answers to the keep-alive, and the read they update
+_PUSH_READS = {
+    CMD_GET_POWER_STATE: (READ_POWER, decode_power_state),
+    CMD_GET_INPUT_SOURCE: (READ_SOURCE, decode_byte),
+    CMD_GET_VOLUME: (READ_VOLUME, decode_byte),
+}
+
+
+def device_info_store(hass, config_entry: ConfigEntry) -> Store:
+    """Return the storage holding the cached device info of an entry."""
+    return Store(hass, DEVICE_INFO_STORAGE_VERSION, f"{config_entry.domain}.{config_entry.entry_id}.device_info")
+
+
+@dataclass(frozen=True)
 class SicpData:
+    """Immutable snapshot of a display; compared to skip no-op updates."""
+
     state: bool = None
     input_source: str = None
     volume_level: int = None
@@ -27,45 +70,177 @@ class SicpData:
     model: str = None
     hw_version: str = None
     sw_version: str = None
+    temperature: int = None
+    backlight: int = None
+    signal_present: bool = None
+    operating_hours: int = None
+
+
+def _volume_level(volume: int | None) -> float | None:
+    return (volume / 100.0) if volume is not None else None
+
+
+@dataclass(frozen=True)
+class _SicpRead:
+    """How one polled value is fetched and stored in SicpData."""
+
+    field: str
+    fetch: Callable[[], Awaitable]
+    convert: Callable = lambda value: value
+    # The display refuses the query while off, so it is not sent then
+    needs_power: bool = True
+    # Read at most this often instead of on every poll
+    interval: timedelta | None = None
 
 
 class SicpUpdateCoordinator(DataUpdateCoordinator[SicpData]):
     """HKO Update Coordinator."""
 
-    def __init__(self, hass, config_entry: ConfigEntry, client: Client):
+    def __init__(self, hass, config_entry: ConfigEntry, client: SicpConnection, refresh_rate: int = 30,
+                 min_refresh_rate: int = 5, max_refresh_rate: int = 300, health_refresh_rate: int = 300):
         """Initialize my coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             # Name of the data. For logging purposes.
             name="iiyama SICP",
-            # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(seconds=30),
-            # Set always_update to `False` if the data returned from the
-            # api can be compared via `__eq__` to avoid duplicate updates
-            # being dispatched to listeners
-            always_update=True,
+            # Polled by the shared SicpPollScheduler, not by an own timer.
+            update_interval=None,
+            # SicpData is an immutable dataclass compared via `__eq__`,
+            # so listeners are only called when something changed
+            always_update=False,
             config_entry=config_entry
         )
         self._api_client = client
-        self._api_commands = Commands(client)
+        self._api_commands = SicpCommands(client)
+        self._reads = {
+            READ_POWER: _SicpRead("state", self._api_commands.get_power_state, needs_power=False),
+            READ_SOURCE: _SicpRead("input_source", self._api_commands.get_input_source,
+                                   lambda source: self.profile.source_name(source)),
+            READ_VOLUME: _SicpRead("volume_level", self._api_commands.get_volume, _volume_level),
+        }
+        # Fleet health values change slowly, they ride along with a regular poll now and then
+        health_interval = timedelta(seconds=health_refresh_rate)
+        self._reads.update({
+            READ_TEMPERATURE: _SicpRead("temperature", self._api_commands.get_temperature, interval=health_interval),
+            READ_BACKLIGHT: _SicpRead("backlight", self._api_commands.get_backlight, interval=health_interval),
+            READ_SIGNAL: _SicpRead("signal_present", self._api_commands.get_signal_present, interval=health_interval),
+            READ_OPERATING_HOURS: _SicpRead("operating_hours", self._api_commands.get_operating_hours,
+                                            needs_power=False, interval=health_interval),
+        })
+        self._read_at: dict[str, float] = {}
+        # Confirm once after a burst of commands instead of once per command
+        self._command_queue = SicpCommandQueue(self._async_send_command, self._async_confirm_commands)
+        self._min_interval = timedelta(seconds=min(min_refresh_rate, max_refresh_rate))
+        self._max_interval = timedelta(seconds=max(min_refresh_rate, max_refresh_rate))
+        self._base_interval = min(max(timedelta(seconds=refresh_rate), self._min_interval), self._max_interval)
+        self._active_until = 0.0
+        self._idle_since: float | None = None
+        self._breaker = SicpCircuitBreaker()
+        self._device_info_store = device_info_store(hass, config_entry)
+        self._refused_sources: set[str] = set()
+        self._refused_reads: set[str] = set()
+        self._device_info_connects = 0
+        self._device_info_requested = False
+        self._device_info_retry = DEVICE_INFO_RETRY_MIN
+        self._device_info_retry_at = 0.0
+        self._poll_started: float | None = None
+        self.last_poll_duration: float | None = None
+        self._stats_listeners: list[CALLBACK_TYPE] = []
+        self._unsub_push = client.add_push_listener(self._async_handle_push)
+        # Only once the display is known to be on and to push reports
+        client.set_keepalive_interval(None)
 
-    async def _async_setup(self):
-        """Set up the coordinator
+    @property
+    def poll_interval(self) -> timedelta:
+        """Return the current poll interval, adapted to recent activity."""
+        if self._breaker.is_open:
+            return self._breaker.probe_interval
+        now = monotonic()
+        if now < self._active_until:
+            return self._min_interval
+        if self._api_client.push_active:
+            # Pushed reports keep the state current, polling is only a fallback
+            return self._max_interval
+        if self._idle_since is not None and now - self._idle_since >= IDLE_AFTER.total_seconds():
+            return self._max_interval
+        return self._base_interval
 
-        This is the place to set up your coordinator,
-        or to load data, that only needs to be loaded once.
+    def mark_activity(self):
+        """Poll quickly for a while, e.g. after a command was sent."""
+        self._active_until = monotonic() + ACTIVITY_WINDOW.total_seconds()
 
-        This method will be called automatically during
-        coordinator.async_config_entry_first_refresh.
-        """
+    def _track_idle(self, state: bool | None):
+        if state:
+            self._idle_since = None
+        elif self._idle_since is None:
+            self._idle_since = monotonic()
 
-        await self._setup_mac()
+    @property
+    def connection(self) -> SicpConnection:
+        return self._api_client
 
-        try:
-            await self._setup_device_info()
-        except Exception as err:
-            await self.hass.async_add_executor_job(self._api_client.close)
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device of the display, the same for the entities of every platform."""
+        host = self.config_entry.data.get(CONF_HOST)
+        mac = self.config_entry.data.get(CONF_MAC)
+        return DeviceInfo(
+            name=self.config_entry.title,
+            identifiers={(self.config_entry.domain, self.config_entry.entry_id), ("mac", mac), ("host", host)},
+            connections={(dr.CONNECTION_NETWORK_MAC, mac), ("host", host)},
+            manufacturer="Iiyama",
+            **self.device_versions,
+        )
+
+    @property
+    def device_versions(self) -> dict:
+        """Return the model and versions of the display, None while not known."""
+        data = self.data
+        return {
+            "model": data.model if data else None,
+            "hw_version": data.hw_version if data else None,
+            "sw_version": data.sw_version if data else None,
+        }
+
+    @property
+    def profile(self) -> SicpModelProfile:
+        """Return the capabilities of the display, detected from its (cached) model number."""
+        return profile_for_model(self.data.model_id if self.data else None, frozenset(self._refused_sources),
+                                 frozenset(self._refused_reads))
+
+    @property
+    def circuit_breaker(self) -> SicpCircuitBreaker:
+        return self._breaker
+
+    @callback
+    def async_add_stats_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call `update_callback` after every poll, even if the data did not change."""
+        self._stats_listeners.append(update_callback)
+        return lambda: self._stats_listeners.remove(update_callback)
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        if self._poll_started is not None:
+            self.last_poll_duration = monotonic() - self._poll_started
+        for update_callback in list(self._stats_listeners):
+            update_callback()
+
+    @property
+    def has_listeners(self) -> bool:
+        """Return if any entity is subscribed, polling is skipped otherwise."""
+        return bool(self._listeners)
+
+    async def async_restore(self):
+        """Start from the cached device info without contacting the display."""
+        cached = await self._device_info_store.async_load() or {}
+        self.data = SicpData(**{f: cached.get(f) for f in DEVICE_INFO_FIELDS})
+        self._refused_sources = set(cached.get(REFUSED_SOURCES, ()))
+        self._refused_reads = set(cached.get(REFUSED_READS, ()))
+
+    async def _async_save_device_info(self, device_info: dict):
+        await self._device_info_store.async_save({**device_info, REFUSED_SOURCES: sorted(self._refused_sources),
+                                                  REFUSED_READS: sorted(self._refused_reads)})
 
     async def _async_update_data(self):
         """Fetch data from API endpoint.
@@ -73,91 +248,222 @@ class SicpUpdateCoordinator(DataUpdateCoordinator[SicpData]):
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
-        # Note: asyncio.TimeoutError and aiohttp.ClientError are already
-        # handled by the data update coordinator.
-        async with async_timeout.timeout(10):
-            # Grab active context variables to limit data required to be fetched from API
-            # Note: using context is not required if there is no need or ability to limit
-            # data retrieved from API.
+        self._poll_started = monotonic()
+        if self._breaker.is_open:
+            await self._async_probe()
 
-            listening_idx = set(self.async_contexts())
-            _LOGGER.debug("Listening contexts: %s", listening_idx)
-
-        await self._setup_mac()
-
-        if self.data is None:
-            self.data = SicpData()
-        result = self.data
+        previous = self.data or SicpData()
 
         try:
-            await self._setup_device_info()
-
-            # Parallelize state, source, and volume reads to bound total latency
-            state_fut = self.hass.async_add_executor_job(self._api_commands.get_power_state)
-            source_fut = self.hass.async_add_executor_job(self._api_commands.get_input_source)
-            volume_fut = self.hass.async_add_executor_job(self._api_commands.get_volume)
             try:
-                result_state, source_bytes, volume_bytes = await asyncio.gather(state_fut, source_fut, volume_fut)
-                result.state = result_state
-                _LOGGER.debug(f"Got state: {result.state}")
-                source_ = source_bytes[0] if source_bytes else None
-                for k, v in INPUT_SOURCES.items():
-                    if source_ == v:
-                        result.input_source = k
-                result.volume_level = (volume_bytes[0] / 100.0) if volume_bytes else None
+                result = replace(previous, **await self._async_poll_reads(previous.state))
+                _LOGGER.debug("Got state: %s", result.state)
+                if previous.state is not None and any(getattr(previous, f) != getattr(result, f)
+                                                      for f in ACTIVITY_FIELDS):
+                    self.mark_activity()
+                self._track_idle(result.state)
             except socket.error as e:
                 _LOGGER.debug(f"Failed to read device status: {e}")
                 raise e
 
+            result = await self._async_update_device_info(result)
+            # Only once the display answered, its address is in the ARP cache
+            await self._setup_mac()
+
         except socket.timeout as e:
-            await self.hass.async_add_executor_job(self._api_client.close)
+            self._async_poll_failed()
             _LOGGER.debug(f"Socket timeout during update of the device status: {e}")
             raise UpdateFailed(f"Socket timeout: {e}")
         except socket.error as e:
-            await self.hass.async_add_executor_job(self._api_client.close)
-            _LOGGER.error(f"Socket error during update of the device status: {e}")
+            self._async_poll_failed()
+            _LOGGER.debug(f"Socket error during update of the device status: {e}")
             raise UpdateFailed(f"Socket error: {e}")
         except Exception as err:
-            await self.hass.async_add_executor_job(self._api_client.close)
+            self._async_poll_failed()
             _LOGGER.error(f"Failed to update the device status: {err}")
             raise UpdateFailed(f"Error communicating with API: {err}")
+        if self._breaker.record_success():
+            _LOGGER.info("%s is reachable again, polling resumed", self.config_entry.title)
+        self._update_keepalive(result.state)
         return result
 
-    async def _setup_device_info(self):
-        if not self.data:
-            self.data = SicpData()
-        if not self.data.model_id:
-            try:
-                self.data.model_id = await self.hass.async_add_executor_job(self._api_commands.get_model_number)
-            except Exception as e:
-                _LOGGER.debug(f"Failed to get model ID: {e}")
-                self.data.model_id = "Unknown"
-        if (not self.data.model) and self.data.model_id:
-            try:
-                self.data.model = self.data.model_id
-            except Exception as e:
-                _LOGGER.debug(f"Failed to get model name: {e}")
-                self.data.model = "Unknown"
-        if not self.data.hw_version:
-            try:
-                self.data.hw_version = await self.hass.async_add_executor_job(self._api_commands.get_fw_version)
-            except Exception as e:
-                _LOGGER.debug(f"Failed to get hardware version: {e}")
-                self.data.hw_version = "Unknown"
-        if not self.data.sw_version:
+    def _planned_reads(self) -> list[str]:
+        """Return the due reads some listener needs, everything before the first listener subscribes."""
+        if self._listeners:
+            needed = {READ_POWER}
+            for context in self.async_contexts():
+                if context:
+                    needed.update(context)
+        else:
+            needed = set(self._reads)
+        profile = self.profile
+        now = monotonic()
+        return [name for name, read in self._reads.items() if name in needed and profile.supports(name) and (
+                read.interval is None or now - self._read_at.get(name, -read.interval.total_seconds())
+                >= read.interval.total_seconds())]
+
+    async def _async_read(self, names: list[str]) -> dict:
+        """Pipeline the reads over the persistent connection, replies come back in order."""
+        results = await asyncio.gather(*(self._reads[name].fetch() for name in names), return_exceptions=True)
+        state = dict(zip(names, results)).get(READ_POWER, self.data.state if self.data else None)
+        values = {}
+        refused = []
+        for name, value in zip(names, results):
+            if not isinstance(value, Exception):
+                values[self._reads[name].field] = self._reads[name].convert(value)
+            elif state is True and name != READ_POWER and self._is_refusal(value):
+                refused.append(name)
+                values[self._reads[name].field] = None
+            else:
+                raise value
+        now = monotonic()
+        self._read_at.update({name: now for name in names})
+        if refused:
+            _LOGGER.info("%s refuses to report %s, not reading it any more", self.config_entry.title,
+                         ", ".join(refused))
+            self._refused_reads.update(refused)
+            await self._async_save_device_info({f: getattr(self.data, f) for f in DEVICE_INFO_FIELDS})
+        return values
+
+    def _is_refusal(self, error: Exception) -> bool:
+        """Return whether `error` is the display turning down a request; callers only ask while it is on."""
+        return isinstance(error, SicpCommandRejected) and error.reason == REPLY_NAV and bool(
+            self.data and self.data.model_id)
+
+    async def _async_poll_reads(self, previous_state: bool | None) -> dict:
+        """Read the planned values with the fewest round-trips.
+
+        While the display was off only its power state and what it answers
+        in standby is read; the other reads follow in the same poll once it
+        turns out to be on. Values
+        refused while off are cleared instead of being queried.
+        """
+        reads = self._planned_reads()
+        first = [name for name in reads if not self._reads[name].needs_power] if previous_state is False else reads
+        values = await self._async_read(first)
+        state = values["state"]
+        if state and first is not reads:
+            values.update(await self._async_read([name for name in reads if name not in first]))
+        if not state:
+            cleared = [name for name, read in self._reads.items() if read.needs_power]
+            values.update({self._reads[name].field: None for name in cleared})
+            # Read them right away once the display is back on
+            for name in cleared:
+                self._read_at.pop(name, None)
+        return values
+
+    async def _async_probe(self):
+        """Replace the poll of an unreachable display by a bare TCP connect."""
+        reachable = await async_probe_port(self._api_client.host, self._api_client.port)
+        self._breaker.record_probe(reachable)
+        if not reachable:
+            raise UpdateFailed(f"{self._api_client.host} is unreachable, "
+                               f"next probe in {self._breaker.probe_interval.total_seconds():.0f}s")
+        _LOGGER.debug("%s accepts connections again, trying a full poll", self._api_client.host)
+        self._api_client.reset_backoff()
+
+    @callback
+    def _async_handle_push(self, frame: SicpFrame):
+        """Apply a status frame the display sent on its own or in reply to the keep-alive."""
+        if self.data is None or frame.command not in _PUSH_READS:
+            return
+        name, decode = _PUSH_READS[frame.command]
+        read = self._reads[name]
+        data = replace(self.data, **{read.field: read.convert(decode(frame.data))})
+        if name == READ_POWER:
+            self._track_idle(data.state)
+            if not data.state:
+                data = replace(data, **{r.field: None for r in self._reads.values() if r.needs_power})
+            elif self.data.state is False:
+                # Turned on with the remote, read what is only answered while on
+                self.hass.async_create_task(self.async_request_refresh())
+        self._update_keepalive(data.state)
+        if data == self.data:
+            return
+        _LOGGER.debug("%s pushed %s", self._api_client.host, data)
+        self.mark_activity()
+        self.async_set_updated_data(data)
+
+    def _update_keepalive(self, state: bool | None):
+        """Keep the link open for reports while the display is on and pushes them; leave one that is off alone."""
+        self._api_client.set_keepalive_interval(
+            DEFAULT_KEEPALIVE_INTERVAL if state and self._api_client.push_active else None)
+
+    @callback
+    def _async_poll_failed(self):
+        self._track_idle(None)
+        self._update_keepalive(None)
+        if self._breaker.record_failure():
+            _LOGGER.info("%s failed %d polls in a row, probing it every %s until it answers",
+                         self.config_entry.title, self._breaker.failures, self._breaker.probe_interval)
+
+    @staticmethod
+    def _device_info_complete(data: SicpData) -> bool:
+        return all(getattr(data, f) for f in DEVICE_INFO_FIELDS)
+
+    def request_device_info_refresh(self):
+        """Re-read the device info on the next poll."""
+        self._device_info_requested = True
+
+    async def _async_update_device_info(self, data: SicpData) -> SicpData:
+        """Fetch device info if missing, requested or possibly changed.
+
+        A reconnect (e.g. after a reboot for a firmware update) costs one
+        firmware version query; everything is re-read only if it differs.
+        Missing values are retried with exponential backoff.
+        """
+        connects = self._api_client.connects
+        if self._device_info_requested or not self._device_info_complete(data):
+            if not self._device_info_requested and monotonic() < self._device_info_retry_at:
+                return data
+            data = await self._async_fetch_device_info(data)
+        elif connects != self._device_info_connects:
             try:
-                self.data.sw_version = await self.hass.async_add_executor_job(self._api_commands.get_platform_version)
+                hw_version = await self._api_commands.get_fw_version()
             except Exception as e:
-                _LOGGER.debug(f"Failed to get software version: {e}")
-                self.data.sw_version = "Unknown"
+                _LOGGER.debug("Failed to check firmware version: %s", e)
+                return data
+            if hw_version and hw_version != data.hw_version:
+                _LOGGER.info("Firmware of %s changed to %s", self.config_entry.title, hw_version)
+                data = await self._async_fetch_device_info(data)
+        self._device_info_connects = connects
+        return data
+
+    async def _async_fetch_device_info(self, data: SicpData) -> SicpData:
+        self._device_info_requested = False
+        cached = {f: getattr(data, f) for f in DEVICE_INFO_FIELDS}
+        current = dict(cached)
+        results = await asyncio.gather(self._api_commands.get_model_number(),
+                                       self._api_commands.get_fw_version(),
+                                       self._api_commands.get_platform_version(), return_exceptions=True)
+        for f, value in zip(("model_id", "hw_version", "sw_version"), results):
+            if isinstance(value, Exception):
+                _LOGGER.debug("Failed to get %s: %s", f, value)
+            elif value:
+                current[f] = value
+        if current["model_id"]:
+            current["model"] = current["model_id"]
+        data = replace(data, **current)
+
+        if self._device_info_complete(data):
+            self._device_info_retry = DEVICE_INFO_RETRY_MIN
+            self._device_info_retry_at = 0.0
+        else:
+            self._device_info_retry_at = monotonic() + self._device_info_retry.total_seconds()
+            self._device_info_retry = min(self._device_info_retry * 2, DEVICE_INFO_RETRY_MAX)
+        if current != cached:
+            if cached["model_id"] and current["model_id"] != cached["model_id"]:
+                # Another panel, learn again what it refuses
+                self._refused_sources.clear()
+                self._refused_reads.clear()
+            await self._async_save_device_info(current)
+        return data
 
     async def _setup_mac(self):
         try:
             data = {**self.config_entry.data}
             if not (CONF_MAC in data and data[CONF_MAC]):
-                mac = await self.hass.async_add_executor_job(
-                    partial(getmac.get_mac_address, ip=data[CONF_HOST], hostname=data[CONF_HOST])
-                )
+                mac = await self.hass.async_add_executor_job(get_mac_address, data[CONF_HOST])
                 data[CONF_MAC] = mac
                 self.hass.config_entries.async_update_entry(self.config_entry, data=data, minor_version=1, version=1)
         except Exception as e:
@@ -165,20 +471,99 @@ class SicpUpdateCoordinator(DataUpdateCoordinator[SicpData]):
 
     async def async_shutdown(self) -> None:
         await super().async_shutdown()
-        await self.hass.async_add_executor_job(self._api_client.close)
+        self._unsub_push()
+        self._command_queue.cancel()
+        await self._api_client.close()
+
+    async def _async_send_command(self, kind: str, value):
+        if kind == COMMAND_POWER:
+            await self._api_commands.set_power_state(value)
+        elif kind == COMMAND_SOURCE:
+            try:
+                await self._api_commands.set_input_source(value)
+            except SicpCommandRejected as e:
+                if self.data and self.data.state and self._is_refusal(e):
+                    await self._async_refuse_source(value)
+                raise
+        elif kind == COMMAND_VOLUME:
+            await self._api_commands.set_volume(value)
+        # An answered command proves the display is reachable
+        self._breaker.record_success()
+
+    async def _async_refuse_source(self, value: int):
+        """Stop offering a source the display turned down while on."""
+        source = self.profile.source_name(value)
+        if source is None:
+            return
+        _LOGGER.info("%s refuses input source %s, no longer offering it", self.config_entry.title, source)
+        self._refused_sources.add(source)
+        await self._async_save_device_info({f: getattr(self.data, f) for f in DEVICE_INFO_FIELDS})
+        self.async_update_listeners()
+
+    async def _async_confirm_commands(self, kinds: set[str]):
+        """Read back only what the commands changed.
+
+        Listeners are always notified, so entities showing an optimistic
+        value fall back to what the device reports.
+        """
+        if self.data is None:
+            await self.async_request_refresh()
+            return
+        reads = [self._reads[_COMMAND_READS[k]] for k in _COMMAND_READS if k in kinds]
+        results = await asyncio.gather(*(read.fetch() for read in reads), return_exceptions=True)
+        updates = {}
+        for read, value in zip(reads, results):
+            if isinstance(value, Exception):
+                _LOGGER.debug("Failed to confirm %s: %s", read.field, value)
+                continue
+            updates[read.field] = read.convert(value)
+        if not updates:
+            await self.async_request_refresh()
+            return
+        self.async_set_updated_data(replace(self.data, **updates))
 
     async def async_set_volume_level(self, volume):
         """Set volume level."""
-        await self.hass.async_add_executor_job(partial(self._api_commands.set_volume, volume=int(volume * 100)))
+        if not self.profile.supports(READ_VOLUME):
+            raise SicpCommandUnsupported(f"{self.profile.name} has no volume control")
+        self.mark_activity()
+        await self._command_queue.async_submit(COMMAND_VOLUME, int(volume * 100))
 
     async def async_select_source(self, source):
         """Send source select command."""
-        await self.hass.async_add_executor_job(self._api_commands.set_input_source, INPUT_SOURCES[source])
+        source_byte = self.profile.source_byte(source)
+        self.mark_activity()
+        await self._command_queue.async_submit(COMMAND_SOURCE, source_byte)
 
     async def async_turn_off(self):
         """Send turn off command."""
-        await self.hass.async_add_executor_job(self._api_commands.set_power_state, False)
+        self.mark_activity()
+        await self._command_queue.async_submit(COMMAND_POWER, False)
+
+    async def async_turn_on(self, mac_addresses=(), broadcast_address: str | None = None,
+                            broadcast_port: int | None = None):
+        """Send turn on command, waking the display over LAN if needed.
 
-    async def async_turn_on(self):
-        """Send turn on command."""
-        await self.hass.async_add_executor_job(self._api_commands.set_power_state, True)
+        Magic packets are sent in parallel with the SICP command. If the
+        display does not answer, it is probed until its SICP port accepts
+        connections and the command is sent again.
+        """
+        self.mark_activity()
+        if not mac_addresses:
+            await self._command_queue.async_submit(COMMAND_POWER, True)
+            return
+        waker = self.hass.async_create_background_task(
+            async_wake(mac_addresses, broadcast_address, broadcast_port), f"iiyama SICP wake {self._api_client.host}")
+        try:
+            try:
+                await self._command_queue.async_submit(COMMAND_POWER, True)
+                return
+            except OSError as e:
+                _LOGGER.debug("Power on of %s failed, waiting for it to wake up: %s", self._api_client.host, e)
+            if not await async_wait_until_ready(self._api_client.host, self._api_client.port,
+                                                POWER_ON_TIMEOUT.total_seconds()):
+                raise WakeTimeoutError(f"{self._api_client.host} did not wake up within {POWER_ON_TIMEOUT}")
+            self._api_client.reset_backoff()
+            await self._command_queue.async_submit(COMMAND_POWER, True)
+        finally:
+            waker.cancel()
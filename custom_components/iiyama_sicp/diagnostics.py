@@ -0,0 +1,35 @@
+"""Diagnostics of the iiyama SICP integration."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+
+TO_REDACT = {CONF_MAC}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry) -> dict[str, Any]:
+    """Return connection counters, command latencies and the last data of an entry."""
+    coordinator = config_entry.runtime_data['coordinator']
+    connection = coordinator.connection
+    return {
+        "entry": {
+            "data": async_redact_data(config_entry.data, TO_REDACT),
+            "options": async_redact_data(config_entry.options, TO_REDACT),
+        },
+        "data": asdict(coordinator.data) if coordinator.data else None,
+        "last_update_success": coordinator.last_update_success,
+        "last_poll_duration_ms": round(coordinator.last_poll_duration * 1000, 1)
+        if coordinator.last_poll_duration is not None else None,
+        "poll_interval_s": coordinator.poll_interval.total_seconds(),
+        "profile": coordinator.profile.name,
+        "sources": list(coordinator.profile.sources),
+        "reads": sorted(coordinator.profile.features),
+        "circuit_breaker": coordinator.circuit_breaker.as_dict(),
+        "connection": {"connected": connection.connected, **connection.counters},
+        "requests": connection.stats.as_dict(),
+    }
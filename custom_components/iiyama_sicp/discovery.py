@@ -0,0 +1,85 @@
+"""Discovery of SICP displays by scanning a subnet."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+from dataclasses import dataclass
+
+from .sicp import SICP_PORT, SicpClient, SicpCommands, SicpError
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SCAN_CONCURRENCY = 64
+PROBE_TIMEOUT = 1.0
+# Refuse to scan more than a /22 from the config flow
+MAX_SCAN_HOSTS = 1024
+
+
+@dataclass(frozen=True)
+class DiscoveredDisplay:
+    host: str
+    model_id: str | None
+    mac: str | None
+    broadcast_address: str
+
+
+def parse_network(subnet: str) -> ipaddress.IPv4Network:
+    """Parse a subnet like 192.168.1.0/24; raises ValueError if unusable."""
+    network = ipaddress.ip_network(subnet.strip(), strict=False)
+    if network.version != 4:
+        raise ValueError("Only IPv4 subnets can be scanned")
+    if network.num_addresses > MAX_SCAN_HOSTS:
+        raise ValueError(f"Subnet {network} has more than {MAX_SCAN_HOSTS} addresses")
+    return network
+
+
+async def async_probe(host: str, port: int = SICP_PORT, timeout: float = PROBE_TIMEOUT) -> tuple[bool, str | None]:
+    """Return whether `host` answers SICP and its model number if it tells."""
+    client = SicpClient(host, port, timeout=timeout)
+    try:
+        return True, await SicpCommands(client).get_model_number()
+    except (OSError, SicpError):
+        return False, None
+    finally:
+        await client.close()
+
+
+async def async_scan(hass, network: ipaddress.IPv4Network, port: int = SICP_PORT,
+                     concurrency: int = DEFAULT_SCAN_CONCURRENCY) -> list[DiscoveredDisplay]:
+    """Probe every host of `network` with at most `concurrency` probes at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str):
+        async with semaphore:
+            return host, *await async_probe(host, port)
+
+    hosts = [str(ip) for ip in (network.hosts() if network.num_addresses > 1 else [network.network_address])]
+    results = [(host, model_id) for host, found, model_id in await asyncio.gather(*(probe(h) for h in hosts))
+               if found]
+    _LOGGER.debug("Found %d SICP displays in %s", len(results), network)
+    if not results:
+        return []
+
+    # The probes just populated the ARP cache, resolve all MACs in one executor job
+    macs = await hass.async_add_executor_job(_get_mac_addresses, [host for host, _ in results])
+    return [DiscoveredDisplay(host=host, model_id=model_id, mac=mac, broadcast_address=str(network.broadcast_address))
+            for (host, model_id), mac in zip(results, macs)]
+
+
+def get_mac_address(host: str) -> str | None:
+    """Resolve the MAC address of `host`; blocking, run it in the executor."""
+    # getmac is only needed here, load it in the executor thread instead of at import
+    import getmac
+    return getmac.get_mac_address(ip=host, hostname=host)
+
+
+def _get_mac_addresses(hosts: list[str]) -> list[str | None]:
+    macs = []
+    for host in hosts:
+        try:
+            macs.append(get_mac_address(host))
+        except Exception as e:
+            _LOGGER.debug("Failed to get MAC address of %s: %s", host, e)
+            macs.append(None)
+    return macs
@@ -1,11 +1,8 @@
 """ mqtt-mediaplayer """
 import homeassistant.helpers.config_validation as cv
-import inspect
 import logging
 import re
-import socket
 import voluptuous as vol
-import wakeonlan
 from homeassistant.components.media_player import PLATFORM_SCHEMA, MediaPlayerEntity, MediaPlayerEntityFeature, \
     MediaPlayerState
 from homeassistant.config_entries import ConfigEntry
@@ -13,13 +10,14 @@ from homeassistant.const import (
     CONF_NAME,
     CONF_HOST, CONF_MAC, )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import CONF_WOL_TARGET, DOMAIN, CONF_WOL_PORT, SicpUpdateCoordinator
-from pyamasicp.commands import INPUT_SOURCES
+from .profiles import READ_POWER, READ_SOURCE, READ_VOLUME, SicpModelProfile
 
 # SCAN_INTERVAL = timedelta(minutes=1)
 _LOGGER = logging.getLogger(__name__)
@@ -42,13 +40,12 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry,
                             async_add_entities: AddEntitiesCallback) -> None:
     """Set up ESPHome binary sensors based on a config entry."""
-    async_add_entities([(IiyamaSicpMediaPlayer(hass, DeviceInfo(name=config_entry.title,
-                                                                identifiers={(DOMAIN, config_entry.entry_id)}),
-                                               config_entry.runtime_data['coordinator'],
+    coordinator = config_entry.runtime_data['coordinator']
+    async_add_entities([(IiyamaSicpMediaPlayer(hass, coordinator.device_info, coordinator,
                                                config_entry.data.get(CONF_NAME), config_entry.data.get(CONF_HOST),
                                                config_entry.data.get(CONF_MAC),
                                                config_entry.data.get(CONF_WOL_TARGET),
-                                               config_entry.data.get(CONF_WOL_PORT)))], True)
+                                               config_entry.data.get(CONF_WOL_PORT)))])
 
 
 class IiyamaSicpMediaPlayer(CoordinatorEntity[SicpUpdateCoordinator], MediaPlayerEntity):
@@ -59,7 +56,7 @@ class IiyamaSicpMediaPlayer(CoordinatorEntity[SicpUpdateCoordinator], MediaPlaye
                  broadcast_address: str, broadcast_port: int) -> None:
         """Initialize"""
 
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=(READ_POWER, READ_SOURCE, READ_VOLUME))
         self._attr_device_info = device_info
         _LOGGER.debug("IiyamaSicpMediaPlayer.__init__(%s, %s, %s, %s)" % (name, host, mac, broadcast_address))
         self.hass = hass
@@ -72,65 +69,89 @@ class IiyamaSicpMediaPlayer(CoordinatorEntity[SicpUpdateCoordinator], MediaPlaye
         self._host = host
         self._mac = mac
 
-        self._attr_supported_features |= MediaPlayerEntityFeature.VOLUME_STEP
-        self._attr_supported_features |= MediaPlayerEntityFeature.VOLUME_SET
-        self._attr_supported_features |= MediaPlayerEntityFeature.SELECT_SOURCE
-        self._attr_supported_features |= MediaPlayerEntityFeature.VOLUME_MUTE
-        self._attr_supported_features |= MediaPlayerEntityFeature.TURN_OFF
-        self._attr_supported_features |= MediaPlayerEntityFeature.TURN_ON
-        self._attr_source_list = [b.replace(" ", " ") for b in INPUT_SOURCES.keys()]
+        self._profile = None
+        self._apply_profile(coordinator.profile)
         self._initiated = False
-        self._attr_device_info["manufacturer"] = "Iiyama"
-        self._attr_device_info["identifiers"].add(("mac", self._mac))
-        self._attr_device_info["identifiers"].add(("host", self._host))
-        self._attr_device_info["connections"] = {(dr.CONNECTION_NETWORK_MAC, self._mac), ("host", self._host)}
+        self._written = None
+        self._device_versions = coordinator.device_versions
+
+    def _apply_profile(self, profile: SicpModelProfile) -> None:
+        """Offer only the sources and features the model supports."""
+        self._profile = profile
+        self._attr_supported_features = (MediaPlayerEntityFeature.SELECT_SOURCE | MediaPlayerEntityFeature.TURN_OFF
+                                         | MediaPlayerEntityFeature.TURN_ON)
+        if profile.supports(READ_VOLUME):
+            self._attr_supported_features |= MediaPlayerEntityFeature.VOLUME_STEP
+            self._attr_supported_features |= MediaPlayerEntityFeature.VOLUME_SET
+            self._attr_supported_features |= MediaPlayerEntityFeature.VOLUME_MUTE
+        self._attr_source_list = list(profile.sources)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         self._attr_state = MediaPlayerState.ON if hasattr(self.coordinator.data,
                                                           'state') and self.coordinator.data.state else MediaPlayerState.OFF
-
-        _LOGGER.debug(f"State updated to: {self._attr_state} from {inspect.getmembers(self.coordinator.data)}")
         self._attr_source = self.coordinator.data.input_source
         self._attr_volume_level = self.coordinator.data.volume_level
 
+        profile = self.coordinator.profile
+        if profile is not self._profile:
+            self._apply_profile(profile)
+            self._written = None
+
+        device_versions = self.coordinator.device_versions
+        if device_versions != self._device_versions and self.device_entry is not None:
+            self._device_versions = device_versions
+            dr.async_get(self.hass).async_update_device(self.device_entry.id, **device_versions)
+
+        written = (self.available, self._attr_state, self._attr_source, self._attr_volume_level)
+        if written == self._written:
+            return
+        self._written = written
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("State updated to: %s from %s", self._attr_state, self.coordinator.data)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_write_optimistic(self, **attrs) -> None:
+        """Show the expected state right away; the coordinator confirms it."""
+        for key, value in attrs.items():
+            setattr(self, f"_attr_{key}", value)
+        self._written = (self.available, self._attr_state, self._attr_source, self._attr_volume_level)
         self.async_write_ha_state()
 
+    async def _async_command(self, command) -> None:
+        try:
+            await command
+        except Exception:
+            # Back to the last state reported by the device
+            self._handle_coordinator_update()
+            raise
+
     async def async_set_volume_level(self, volume: float) -> None:
-        await self.coordinator.async_set_volume_level(volume)
-        await self.coordinator.async_request_refresh()
+        profile = self.coordinator.profile
+        if not profile.supports(READ_VOLUME):
+            raise ServiceValidationError(translation_domain=DOMAIN, translation_key="volume_unsupported",
+                                         translation_placeholders={"model": profile.name})
+        self._async_write_optimistic(volume_level=volume)
+        await self._async_command(self.coordinator.async_set_volume_level(volume))
 
     async def async_select_source(self, source):
         """Send source select command."""
-        await self.coordinator.async_select_source(source)
-        await self.coordinator.async_request_refresh()
+        profile = self.coordinator.profile
+        if not profile.has_source(source):
+            raise ServiceValidationError(translation_domain=DOMAIN, translation_key="source_unsupported",
+                                         translation_placeholders={"model": profile.name, "source": source})
+        self._async_write_optimistic(source=source)
+        await self._async_command(self.coordinator.async_select_source(source))
 
     async def async_turn_off(self):
         """Send turn off command."""
-        await self.coordinator.async_turn_off()
-        await self.coordinator.async_request_refresh()
+        self._async_write_optimistic(state=MediaPlayerState.OFF)
+        await self._async_command(self.coordinator.async_turn_off())
 
     async def async_turn_on(self):
         """Send turn on command."""
-
-        try:
-            await self.coordinator.async_turn_on()
-        except socket.error:
-            self.wake_on_lan()
-        await self.coordinator.async_request_refresh()
-
-    def wake_on_lan(self):
-        service_kwargs = {}
-        if self._broadcast_address is not None:
-            service_kwargs["ip_address"] = self._broadcast_address
-        if self._broadcast_port is not None:
-            service_kwargs["port"] = self._broadcast_port
-
-        _LOGGER.debug(
-            "Send magic packet to mac %s (broadcast: %s, port: %s)",
-            self._mac_addresses,
-            self._broadcast_address,
-            self._broadcast_port,
-        )
-        wakeonlan.send_magic_packet(*self._mac_addresses, **service_kwargs)
+        self._async_write_optimistic(state=MediaPlayerState.ON)
+        await self._async_command(self.coordinator.async_turn_on(self._mac_addresses, self._broadcast_address,
+                                                                 self._broadcast_port))
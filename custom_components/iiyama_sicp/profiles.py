@@ -0,0 +1,77 @@
+"""Capabilities of display models, detected from the reported model number."""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+
+from .sicp import INPUT_SOURCES, SicpCommandUnsupported
+
+# Values polled from a display, also passed by entities as the context of their coordinator listener
+READ_POWER = "power"
+READ_SOURCE = "source"
+READ_VOLUME = "volume"
+READ_TEMPERATURE = "temperature"
+READ_BACKLIGHT = "backlight"
+READ_SIGNAL = "signal"
+READ_OPERATING_HOURS = "operating_hours"
+ALL_READS = frozenset((READ_POWER, READ_SOURCE, READ_VOLUME, READ_TEMPERATURE, READ_BACKLIGHT, READ_SIGNAL,
+                       READ_OPERATING_HOURS))
+
+INPUT_SOURCE_NAMES = {value: name for name, value in INPUT_SOURCES.items()}
+
+
+@dataclass(frozen=True)
+class SicpModelProfile:
+    """Input sources and reads a model supports, with lookup tables in both directions."""
+
+    name: str
+    # Model numbers matching this pattern use the profile
+    pattern: str | None = None
+    sources: tuple[str, ...] = tuple(INPUT_SOURCES)
+    features: frozenset[str] = ALL_READS
+    _source_bytes: dict[str, int] = field(init=False, repr=False, compare=False)
+    _source_names: dict[int, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        source_bytes = {name: INPUT_SOURCES[name] for name in self.sources}
+        object.__setattr__(self, "_source_bytes", source_bytes)
+        object.__setattr__(self, "_source_names", {value: name for name, value in source_bytes.items()})
+
+    def supports(self, feature: str) -> bool:
+        return feature in self.features
+
+    def has_source(self, name: str) -> bool:
+        return name in self._source_bytes
+
+    def source_byte(self, name: str) -> int:
+        """Return the byte selecting source `name`; raises if the model does not have it."""
+        try:
+            return self._source_bytes[name]
+        except KeyError:
+            raise SicpCommandUnsupported(f"{self.name} has no input source {name}") from None
+
+    def source_name(self, value: int | None) -> str | None:
+        """Return the name of a reported source byte, even one the profile does not list."""
+        return self._source_names.get(value) or INPUT_SOURCE_NAMES.get(value)
+
+
+DEFAULT_PROFILE = SicpModelProfile("Unknown model")
+
+# Only add a model with the input list and commands from its SICP documentation; a source left out
+# here is refused without asking the display. Models not listed use DEFAULT_PROFILE, narrowed down
+# by what the display turned out to refuse.
+PROFILES: tuple[SicpModelProfile, ...] = ()
+
+
+@lru_cache(maxsize=32)
+def profile_for_model(model_id: str | None, refused_sources: frozenset[str] = frozenset(),
+                      refused_reads: frozenset[str] = frozenset()) -> SicpModelProfile:
+    """Return the profile of a model number without the sources and reads its display refused."""
+    profile = DEFAULT_PROFILE
+    if model_id:
+        profile = next((p for p in PROFILES if re.match(p.pattern, model_id, re.IGNORECASE)), DEFAULT_PROFILE)
+    if not refused_sources and not refused_reads:
+        return profile
+    return replace(profile, sources=tuple(s for s in profile.sources if s not in refused_sources),
+                   features=profile.features - refused_reads)
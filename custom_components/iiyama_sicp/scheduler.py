@@ -0,0 +1,84 @@
+"""Single poller shared by all configured displays."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import zlib
+from datetime import timedelta
+from time import monotonic
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .coordinator import SicpUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+TICK_INTERVAL = timedelta(seconds=1)
+DEFAULT_MAX_CONCURRENT_POLLS = 8
+
+
+class SicpPollScheduler:
+    """Poll every registered coordinator from one timer.
+
+    Each display is polled once its own (adaptive) poll interval has passed
+    since its previous poll. The first poll is placed at a fixed phase within
+    that interval so displays do not fire together, and at most `max_concurrent`
+    displays are polled at the same time. Results reach the entities
+    through each coordinator's own listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent: int = DEFAULT_MAX_CONCURRENT_POLLS):
+        self._hass = hass
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._last_poll: dict[SicpUpdateCoordinator, float] = {}
+        self._running: set[SicpUpdateCoordinator] = set()
+        self._unsub_tick: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_register(self, coordinator: SicpUpdateCoordinator) -> CALLBACK_TYPE:
+        """Start polling `coordinator`; returns a callback removing it again."""
+        interval = coordinator.poll_interval.total_seconds()
+        phase = zlib.crc32(coordinator.config_entry.entry_id.encode()) % 1000 / 1000
+        self._last_poll[coordinator] = monotonic() - (1 - phase) * interval
+        if self._unsub_tick is None:
+            self._unsub_tick = async_track_time_interval(self._hass, self._async_tick, TICK_INTERVAL,
+                                                         name="iiyama SICP poll scheduler", cancel_on_shutdown=True)
+
+        @callback
+        def unregister():
+            self._last_poll.pop(coordinator, None)
+            if not self._last_poll and self._unsub_tick is not None:
+                self._unsub_tick()
+                self._unsub_tick = None
+
+        return unregister
+
+    @callback
+    def _async_tick(self, _now=None):
+        now = monotonic()
+        for coordinator, last_poll in self._last_poll.items():
+            if now - last_poll < coordinator.poll_interval.total_seconds():
+                continue
+            if coordinator in self._running or not coordinator.has_listeners:
+                continue
+            self._start_poll(coordinator, now)
+
+    @callback
+    def async_poll_now(self, coordinator: SicpUpdateCoordinator):
+        """Poll a registered `coordinator` right away, unless a poll of it is already running."""
+        if coordinator in self._last_poll and coordinator not in self._running:
+            self._start_poll(coordinator, monotonic())
+
+    def _start_poll(self, coordinator: SicpUpdateCoordinator, now: float):
+        self._last_poll[coordinator] = now
+        self._running.add(coordinator)
+        self._hass.async_create_background_task(self._async_poll(coordinator),
+                                                f"iiyama SICP poll {coordinator.config_entry.title}")
+
+    async def _async_poll(self, coordinator: SicpUpdateCoordinator):
+        try:
+            async with self._semaphore:
+                await coordinator.async_refresh()
+        finally:
+            self._running.discard(coordinator)
@@ -0,0 +1,169 @@
+"""Health and diagnostic sensors of the iiyama SICP integration."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorEntityDescription, \
+    SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_MAC, PERCENTAGE, EntityCategory, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from . import SicpUpdateCoordinator
+from .coordinator import SicpData
+from .profiles import READ_BACKLIGHT, READ_OPERATING_HOURS, READ_TEMPERATURE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SicpSensorEntityDescription(SensorEntityDescription):
+    # Coordinator read polled for this sensor
+    read: str
+    value_fn: Callable[[SicpData], Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class SicpStatsSensorEntityDescription(SensorEntityDescription):
+    value_fn: Callable[[SicpUpdateCoordinator], Any]
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+SENSORS = (
+    SicpSensorEntityDescription(
+        key="temperature",
+        translation_key="temperature",
+        read=READ_TEMPERATURE,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.temperature,
+    ),
+    SicpSensorEntityDescription(
+        key="backlight",
+        translation_key="backlight",
+        read=READ_BACKLIGHT,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.backlight,
+    ),
+    SicpSensorEntityDescription(
+        key="operating_hours",
+        translation_key="operating_hours",
+        read=READ_OPERATING_HOURS,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda data: data.operating_hours,
+    ),
+)
+
+STATS_SENSORS = (
+    SicpStatsSensorEntityDescription(
+        key="last_poll_duration",
+        translation_key="last_poll_duration",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: _ms(c.last_poll_duration),
+    ),
+    SicpStatsSensorEntityDescription(
+        key="command_latency",
+        translation_key="command_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: _ms(c.connection.stats.mean_latency),
+    ),
+    SicpStatsSensorEntityDescription(
+        key="timeouts",
+        translation_key="timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.connection.stats.timeouts,
+    ),
+    SicpStatsSensorEntityDescription(
+        key="socket_errors",
+        translation_key="socket_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.connection.stats.socket_errors,
+    ),
+    SicpStatsSensorEntityDescription(
+        key="reconnects",
+        translation_key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.connection.reconnects,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry,
+                            async_add_entities: AddEntitiesCallback) -> None:
+    """Set up the sensors of a config entry."""
+    coordinator = config_entry.runtime_data['coordinator']
+    device_info = coordinator.device_info
+    unique_prefix = f"iiyama_sicp_{config_entry.data.get(CONF_HOST)}_{config_entry.data.get(CONF_MAC)}"
+    async_add_entities([IiyamaSicpSensor(coordinator, description, device_info, unique_prefix)
+                        for description in SENSORS if coordinator.profile.supports(description.read)] +
+                       [IiyamaSicpStatsSensor(coordinator, description, device_info, unique_prefix)
+                        for description in STATS_SENSORS])
+
+
+class IiyamaSicpSensor(CoordinatorEntity[SicpUpdateCoordinator], SensorEntity):
+    """Health value of a display, read by the coordinator only while this sensor is enabled."""
+
+    _attr_has_entity_name = True
+
+    entity_description: SicpSensorEntityDescription
+
+    def __init__(self, coordinator: SicpUpdateCoordinator, description: SicpSensorEntityDescription,
+                 device_info: DeviceInfo, unique_prefix: str) -> None:
+        super().__init__(coordinator, context=(description.read,))
+        self.entity_description = description
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{unique_prefix}_{description.key}"
+
+    @property
+    def native_value(self):
+        data = self.coordinator.data
+        return self.entity_description.value_fn(data) if data else None
+
+
+class IiyamaSicpStatsSensor(SensorEntity):
+    """Request statistics of a display, updated after every poll."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    entity_description: SicpStatsSensorEntityDescription
+
+    def __init__(self, coordinator: SicpUpdateCoordinator, description: SicpStatsSensorEntityDescription,
+                 device_info: DeviceInfo, unique_prefix: str) -> None:
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{unique_prefix}_{description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._attr_native_value = self.entity_description.value_fn(self.coordinator)
+        self.async_on_remove(self.coordinator.async_add_stats_listener(self._handle_stats_update))
+
+    @callback
+    def _handle_stats_update(self) -> None:
+        value = self.entity_description.value_fn(self.coordinator)
+        if value == self._attr_native_value:
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
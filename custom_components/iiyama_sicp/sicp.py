@@ -0,0 +1,315 @@
+"""Asyncio implementation of the SICP protocol."""
+from __future__ import annotations
+
+import asyncio
+import binascii
+import functools
+import logging
+import operator
+from dataclasses import dataclass
+
+_LOGGER = logging.getLogger(__name__)
+
+SICP_PORT = 5000
+DEFAULT_MONITOR_ID = 0x01
+
+HEADER = 0xA6
+RESPONSE_HEADER = 0x21
+CATEGORY = 0x00
+CODE0 = 0x00
+CODE1 = 0x00
+DATA_CONTROL = 0x01
+
+# Fixed part of a reply before the payload: header, id, category, code0, length
+RESPONSE_HEAD_SIZE = 5
+
+CMD_ACK = 0x00
+CMD_GET_MISC_INFO = 0x0F
+CMD_SET_POWER_STATE = 0x18
+CMD_GET_POWER_STATE = 0x19
+CMD_GET_TEMPERATURE = 0x2F
+CMD_GET_VIDEO_PARAMETERS = 0x33
+CMD_SET_VOLUME = 0x44
+CMD_GET_VOLUME = 0x45
+CMD_GET_SIGNAL_STATUS = 0x59
+CMD_GET_INFO = 0xA1
+CMD_GET_VERSION = 0xA2
+CMD_SET_INPUT_SOURCE = 0xAC
+CMD_GET_INPUT_SOURCE = 0xAD
+
+COMMAND_NAMES = {
+    CMD_GET_MISC_INFO: "get_misc_info",
+    CMD_SET_POWER_STATE: "set_power_state",
+    CMD_GET_POWER_STATE: "get_power_state",
+    CMD_GET_TEMPERATURE: "get_temperature",
+    CMD_GET_VIDEO_PARAMETERS: "get_video_parameters",
+    CMD_SET_VOLUME: "set_volume",
+    CMD_GET_VOLUME: "get_volume",
+    CMD_GET_SIGNAL_STATUS: "get_signal_status",
+    CMD_GET_INFO: "get_info",
+    CMD_GET_VERSION: "get_version",
+    CMD_SET_INPUT_SOURCE: "set_input_source",
+    CMD_GET_INPUT_SOURCE: "get_input_source",
+}
+
+MODEL_INFO_MODEL_NUMBER = 0x00
+MODEL_INFO_FW_VERSION = 0x01
+VERSION_INFO_PLATFORM_VERSION = 0x02
+MISC_INFO_OPERATING_HOURS = 0x02
+
+VAL_POWER_OFF = 0x01
+VAL_POWER_ON = 0x02
+
+# In the order they are offered in the UI
+INPUT_SOURCES = {
+    "HDMI 1": 0x0D,
+    "HDMI 2": 0x06,
+    "HDMI 3": 0x0F,
+    "HDMI 4": 0x19,
+
+    "Display Port 1": 0x0A,
+    "Display Port 2": 0x07,
+    "Display Port": 0x01,
+
+    "USB 1": 0x0C,
+    "USB 2": 0x08,
+
+    "VIDEO": 0x00,
+    "S-VIDEO": 0x02,
+    "COMPONENT": 0x03,
+    "VGA": 0x05,
+    "DVI-D": 0x0E,
+
+    "Card DVI-D": 0x09,
+    "Card OPS": 0x0B,
+
+    "BROWSER": 0x10,
+    "SMARTCMS": 0x11,
+    "INTERNAL STORAGE": 0x13,
+    "Media Player": 0x16,
+    "PDF Player": 0x17,
+    "DMS (Digital Media Server)": 0x12,
+    "Reserved": 0x14,
+    "Custom": 0x18,
+}
+
+REPLY_ACK = 0x00
+REPLY_NAV = 0x03
+REPLY_REASONS = {
+    0x01: "Limit Over; the data value was over the upper limit.",
+    0x02: "Limit Over; the data value was over the lower limit.",
+    0x03: "Command canceled; the data value is incorrect or the request is not permitted now (NAV).",
+    0x04: "Parse Error; undefined format or checksum error (NACK).",
+}
+
+
+class SicpError(Exception):
+    """Base error of the SICP transport."""
+
+
+class SicpProtocolError(SicpError):
+    """Reply frame could not be parsed or does not belong to the request."""
+
+
+class SicpCommandUnsupported(SicpError):
+    """The model cannot handle the command, so it was refused without sending it."""
+
+
+class SicpCommandRejected(SicpError):
+    """Display answered the request with NAV/NACK instead of data."""
+
+    def __init__(self, command: int, reason: int):
+        super().__init__("Command 0x%02x rejected: %s" % (
+            command, REPLY_REASONS.get(reason, "Unexpected reply 0x%02x." % reason)))
+        self.command = command
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class SicpFrame:
+    monitor_id: int
+    command: int
+    data: bytes
+
+
+def calculate_checksum(message: bytes) -> int:
+    return functools.reduce(operator.xor, message, 0)
+
+
+def encode_frame(monitor_id: int, command: int, data: bytes = b'') -> bytes:
+    """Build a request frame including the trailing checksum."""
+    payload = bytes([command]) + bytes(data)
+    message = bytes([HEADER, monitor_id, CATEGORY, CODE0, CODE1, len(payload) + 2, DATA_CONTROL]) + payload
+    return message + bytes([calculate_checksum(message)])
+
+
+def decode_frame(frame: bytes) -> SicpFrame:
+    """Validate a complete reply frame and return its content."""
+    if len(frame) < RESPONSE_HEAD_SIZE + 3:
+        raise SicpProtocolError(f"Reply too short: {binascii.hexlify(frame)}")
+    if frame[0] != RESPONSE_HEADER:
+        raise SicpProtocolError("Unexpected reply header 0x%02x" % frame[0])
+    if frame[4] != len(frame) - RESPONSE_HEAD_SIZE:
+        raise SicpProtocolError(f"Reply length mismatch: {binascii.hexlify(frame)}")
+    if calculate_checksum(frame[:-1]) != frame[-1]:
+        raise SicpProtocolError(f"Reply checksum mismatch: {binascii.hexlify(frame)}")
+    if frame[2] != CATEGORY or frame[3] != CODE0 or frame[5] != DATA_CONTROL:
+        raise SicpProtocolError(f"Unexpected reply control bytes: {binascii.hexlify(frame)}")
+    return SicpFrame(monitor_id=frame[1], command=frame[6], data=bytes(frame[7:-1]))
+
+
+async def read_raw_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read the bytes of exactly one reply frame from the stream."""
+    head = await reader.readexactly(RESPONSE_HEAD_SIZE)
+    return head + await reader.readexactly(head[4])
+
+
+async def read_frame(reader: asyncio.StreamReader) -> SicpFrame:
+    """Read exactly one reply frame from the stream."""
+    return decode_frame(await read_raw_frame(reader))
+
+
+def check_reply(monitor_id: int, command: int, frame: SicpFrame) -> bytes:
+    """Return the payload of a reply to `command` or raise on NAV/NACK."""
+    if frame.monitor_id != monitor_id:
+        raise SicpProtocolError("Reply for monitor 0x%02x, expected 0x%02x" % (frame.monitor_id, monitor_id))
+    if frame.command == CMD_ACK:
+        reason = frame.data[0] if frame.data else REPLY_ACK
+        if reason != REPLY_ACK:
+            raise SicpCommandRejected(command, reason)
+        return b''
+    if frame.command != command:
+        raise SicpProtocolError("Reply to command 0x%02x, expected 0x%02x" % (frame.command, command))
+    return frame.data
+
+
+def decode_power_state(data: bytes | None) -> bool | None:
+    """Return the power state carried by a power state reply."""
+    if not data:
+        return None
+    if data[0] == VAL_POWER_ON:
+        return True
+    if data[0] == VAL_POWER_OFF:
+        return False
+    _LOGGER.warning("Unknown power state: %s", binascii.hexlify(data))
+    return None
+
+
+def decode_byte(data: bytes | None) -> int | None:
+    """Return the first payload byte of a reply, e.g. a volume or input source."""
+    return data[0] if data else None
+
+
+class SicpClient:
+    """SICP client speaking over asyncio streams.
+
+    Requests are serialized, the socket is kept open between requests
+    and dropped on any error so the next request reconnects.
+    """
+
+    def __init__(self, host: str, port: int = SICP_PORT, monitor_id: int = DEFAULT_MONITOR_ID,
+                 timeout: float = 3):
+        self.host = host
+        self.port = port
+        self.monitor_id = monitor_id
+        self._timeout = timeout
+        self._lock = asyncio.Lock()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def send(self, command: int, data: bytes = b'') -> bytes:
+        """Send one command and return the payload of its reply."""
+        message = encode_frame(self.monitor_id, command, data)
+        async with self._lock:
+            try:
+                async with asyncio.timeout(self._timeout):
+                    if self._writer is None:
+                        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                    _LOGGER.debug("%s request: %s", self.host, binascii.hexlify(message))
+                    self._writer.write(message)
+                    await self._writer.drain()
+                    frame = await read_frame(self._reader)
+            except BaseException:
+                self._drop()
+                raise
+        _LOGGER.debug("%s reply: 0x%02x %s", self.host, frame.command, binascii.hexlify(frame.data))
+        return check_reply(self.monitor_id, command, frame)
+
+    def _drop(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self):
+        """Close the connection if open."""
+        async with self._lock:
+            writer = self._writer
+            self._drop()
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class SicpCommands:
+    """Typed SICP commands on top of a client providing `send`."""
+
+    def __init__(self, client):
+        self._client = client
+
+    async def get_power_state(self) -> bool | None:
+        return decode_power_state(await self._get(CMD_GET_POWER_STATE))
+
+    async def set_power_state(self, state: bool):
+        await self._client.send(CMD_SET_POWER_STATE, bytes([VAL_POWER_ON if state else VAL_POWER_OFF]))
+
+    async def get_volume(self) -> int | None:
+        return decode_byte(await self._get(CMD_GET_VOLUME))
+
+    async def set_volume(self, volume: int):
+        await self._client.send(CMD_SET_VOLUME, bytes([volume, volume]))
+
+    async def get_input_source(self) -> int | None:
+        return decode_byte(await self._get(CMD_GET_INPUT_SOURCE))
+
+    async def set_input_source(self, input_type: int):
+        await self._client.send(CMD_SET_INPUT_SOURCE, bytes([input_type, 0, 0, 0]))
+
+    async def get_temperature(self) -> int | None:
+        """Return the first temperature sensor in degrees Celsius."""
+        data = await self._get(CMD_GET_TEMPERATURE)
+        return data[0] if data else None
+
+    async def get_backlight(self) -> int | None:
+        """Return the brightness (0-100) from the video parameters."""
+        data = await self._get(CMD_GET_VIDEO_PARAMETERS)
+        return data[0] if data else None
+
+    async def get_signal_present(self) -> bool | None:
+        data = await self._get(CMD_GET_SIGNAL_STATUS)
+        return bool(data[0]) if data else None
+
+    async def get_operating_hours(self) -> int | None:
+        data = await self._get(CMD_GET_MISC_INFO, MISC_INFO_OPERATING_HOURS)
+        return int.from_bytes(data[:2], 'big') if len(data or b'') >= 2 else None
+
+    async def get_model_number(self) -> str | None:
+        return await self._get_string(CMD_GET_INFO, MODEL_INFO_MODEL_NUMBER)
+
+    async def get_fw_version(self) -> str | None:
+        return await self._get_string(CMD_GET_INFO, MODEL_INFO_FW_VERSION)
+
+    async def get_platform_version(self) -> str | None:
+        return await self._get_string(CMD_GET_VERSION, VERSION_INFO_PLATFORM_VERSION)
+
+    async def _get(self, command: int, *data: int) -> bytes | None:
+        try:
+            return await self._client.send(command, bytes(data))
+        except SicpCommandRejected as e:
+            _LOGGER.debug("%s", e)
+            return None
+
+    async def _get_string(self, command: int, item: int) -> str | None:
+        data = await self._get(command, item)
+        return data.decode('utf-8', errors='replace').strip('\x00 ') if data else None
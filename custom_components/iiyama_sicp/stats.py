@@ -0,0 +1,63 @@
+"""Timing and error statistics of SICP requests."""
+from __future__ import annotations
+
+from bisect import bisect_left
+
+from .sicp import COMMAND_NAMES
+
+# Upper bounds in seconds of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_BUCKET_LABELS = [f"<={bound * 1000:g}ms" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1] * 1000:g}ms"]
+
+
+class SicpCommandStats:
+    """Latency histogram of one command."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, latency: float):
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "max_ms": round(self.max * 1000, 1),
+            "histogram": dict(zip(_BUCKET_LABELS, self.buckets)),
+        }
+
+
+class SicpStats:
+    """Per-command latencies and error counts of one connection."""
+
+    def __init__(self):
+        self.commands: dict[int, SicpCommandStats] = {}
+        self.timeouts = 0
+        self.socket_errors = 0
+        self.rejected = 0
+
+    def record(self, command: int, latency: float):
+        if command not in self.commands:
+            self.commands[command] = SicpCommandStats()
+        self.commands[command].record(latency)
+
+    @property
+    def mean_latency(self) -> float | None:
+        count = sum(s.count for s in self.commands.values())
+        return sum(s.total for s in self.commands.values()) / count if count else None
+
+    def as_dict(self) -> dict:
+        return {
+            "timeouts": self.timeouts,
+            "socket_errors": self.socket_errors,
+            "rejected": self.rejected,
+            "commands": {COMMAND_NAMES.get(command, "0x%02x" % command): s.as_dict()
+                         for command, s in sorted(self.commands.items())},
+        }
@@ -0,0 +1,92 @@
+"""Non-blocking Wake on LAN and readiness detection."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+BROADCAST_IP = "255.255.255.255"
+DEFAULT_PORT = 9
+
+# Seconds after the start of a power on at which magic packets are (re)sent
+WAKE_SCHEDULE = (0, 1, 2, 4, 8, 15, 30)
+READY_PROBE_INTERVAL = 0.5
+READY_PROBE_TIMEOUT = 1.0
+
+
+class WakeTimeoutError(TimeoutError):
+    """The display did not accept connections within the time given to wake up."""
+
+
+def create_magic_packet(mac_address: str) -> bytes:
+    """Return the magic packet waking the device with `mac_address`."""
+    mac = re.sub(r"[^0-9a-fA-F]", "", mac_address)
+    if len(mac) != 12:
+        raise ValueError(f"Invalid MAC address: {mac_address}")
+    return b'\xff' * 6 + bytes.fromhex(mac) * 16
+
+
+async def async_send_magic_packets(mac_addresses: Iterable[str], ip_address: str | None = None,
+                                   port: int | None = None):
+    """Send one magic packet per MAC address from a non-blocking UDP socket."""
+    packets = [create_magic_packet(mac) for mac in mac_addresses]
+    if not packets:
+        return
+    transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+        asyncio.DatagramProtocol, remote_addr=(ip_address or BROADCAST_IP, port or DEFAULT_PORT),
+        allow_broadcast=True)
+    try:
+        for packet in packets:
+            transport.sendto(packet)
+    finally:
+        transport.close()
+
+
+async def async_wake(mac_addresses: Iterable[str], ip_address: str | None = None, port: int | None = None,
+                     schedule: Iterable[float] = WAKE_SCHEDULE):
+    """Keep sending magic packets on `schedule` until cancelled or done; invalid MAC addresses are skipped."""
+    valid = []
+    for mac in mac_addresses:
+        try:
+            create_magic_packet(mac)
+        except ValueError as e:
+            _LOGGER.warning("Not waking %s: %s", mac, e)
+        else:
+            valid.append(mac)
+    if not valid:
+        return
+    mac_addresses = valid
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    for at in schedule:
+        await asyncio.sleep(max(0.0, start + at - loop.time()))
+        _LOGGER.debug("Send magic packet to mac %s (broadcast: %s, port: %s)", mac_addresses, ip_address, port)
+        try:
+            await async_send_magic_packets(mac_addresses, ip_address, port)
+        except OSError as e:
+            _LOGGER.warning("Failed to send magic packet: %s", e)
+
+
+async def async_probe_port(host: str, port: int, timeout: float = READY_PROBE_TIMEOUT) -> bool:
+    """Return whether `host:port` accepts a TCP connection within `timeout`."""
+    try:
+        async with asyncio.timeout(timeout):
+            _, writer = await asyncio.open_connection(host, port)
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+async def async_wait_until_ready(host: str, port: int, timeout: float) -> bool:
+    """Probe `host:port` until it accepts TCP connections or `timeout` passes."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if await async_probe_port(host, port, min(READY_PROBE_TIMEOUT, max(deadline - loop.time(), 0.01))):
+            return True
+        await asyncio.sleep(min(READY_PROBE_INTERVAL, max(deadline - loop.time(), 0)))
+    return False
@@ -0,0 +1,153 @@
+"""Latency and throughput benchmark of the coordinator against simulated displays.
+
+Starts `sicp_simulator` displays, drives one SicpUpdateCoordinator per
+display through polls and the commands the media player issues, and
+reports poll latency percentiles, commands per second and thread use.
+Needs Home Assistant installed and is run from the repository root:
+
+    python tools/benchmark.py --displays 100 --rounds 10 --latency 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import logging
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.const import CONF_HOST, CONF_MAC, CONF_NAME  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.iiyama_sicp.connection import SicpConnection  # noqa: E402
+from custom_components.iiyama_sicp.coordinator import SicpUpdateCoordinator  # noqa: E402
+from sicp_simulator import SicpSimulator, add_simulator_arguments, simulator_kwargs  # noqa: E402
+
+DOMAIN = "iiyama_sicp"
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+class _ThreadSampler:
+    """Track the peak number of threads while the benchmark runs."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._task = None
+
+    async def _run(self):
+        while True:
+            self.peak = max(self.peak, threading.active_count())
+            await asyncio.sleep(0.01)
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        self._task.cancel()
+
+
+def create_coordinator(hass: HomeAssistant, host: str, port: int, index: int) -> SicpUpdateCoordinator:
+    mac = f"02:00:00:00:{index // 256:02x}:{index % 256:02x}"
+    kwargs = dict(data={CONF_HOST: host, CONF_NAME: f"display {index}", CONF_MAC: mac},
+                  discovery_keys=MappingProxyType({}), domain=DOMAIN, minor_version=1, options={}, source="user",
+                  title=f"{host}:{port}", unique_id=f"{host}:{port}", version=1)
+    # Required by newer Home Assistant releases, unknown to older ones
+    if "subentries_data" in inspect.signature(ConfigEntry).parameters:
+        kwargs["subentries_data"] = ()
+    config_entry = ConfigEntry(**kwargs)
+    return SicpUpdateCoordinator(hass, config_entry, SicpConnection(host, port, timeout=3))
+
+
+async def _poll(coordinators: list[SicpUpdateCoordinator], rounds: int, concurrency: int) -> tuple[list[float], int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def poll(coordinator):
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append(time.perf_counter() - start)
+            failures += not coordinator.last_update_success
+
+    for _ in range(rounds):
+        await asyncio.gather(*(poll(c) for c in coordinators))
+    return latencies, failures
+
+
+async def _commands(coordinators: list[SicpUpdateCoordinator], burst: int) -> tuple[int, int, float]:
+    """Send a volume slider burst and a source change to every display."""
+
+    async def drive(coordinator):
+        await asyncio.gather(*(coordinator.async_set_volume_level(v / 100) for v in range(burst)),
+                             coordinator.async_select_source("HDMI 2"), return_exceptions=True)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(c) for c in coordinators))
+    elapsed = time.perf_counter() - start
+    submitted = sum(c._command_queue.submitted for c in coordinators)
+    sent = sum(c._command_queue.sent for c in coordinators)
+    return submitted, sent, elapsed
+
+
+async def _main(args: argparse.Namespace):
+    simulator = SicpSimulator.create(args.displays, args.base_port, args.host, **simulator_kwargs(args))
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        executor_jobs = 0
+        add_executor_job = hass.async_add_executor_job
+
+        def counting_add_executor_job(target, *args_):
+            nonlocal executor_jobs
+            executor_jobs += 1
+            return add_executor_job(target, *args_)
+
+        hass.async_add_executor_job = counting_add_executor_job
+        async with simulator:
+            coordinators = [create_coordinator(hass, args.host, d.port, i) for i, d in enumerate(simulator.displays)]
+            for coordinator in coordinators:
+                await coordinator.async_restore()
+            threads_before = threading.active_count()
+            sampler = _ThreadSampler()
+            sampler.start()
+            latencies, failures = await _poll(coordinators, args.rounds, args.concurrency)
+            submitted, sent, elapsed = await _commands(coordinators, args.burst)
+            await hass.async_block_till_done()
+            sampler.stop()
+            for coordinator in coordinators:
+                await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    requests = sum(d.requests for d in simulator.displays)
+    print(f"displays:           {args.displays}")
+    print(f"polls:              {len(latencies)} ({failures} failed)")
+    print(f"poll latency [ms]:  p50 {_percentile(latencies, 50) * 1000:.1f}  p95 {_percentile(latencies, 95) * 1000:.1f}"
+          f"  p99 {_percentile(latencies, 99) * 1000:.1f}  mean {statistics.mean(latencies) * 1000:.1f}")
+    print(f"commands:           {submitted} submitted, {sent} sent, {sent / elapsed:.0f} sent/s in {elapsed:.2f}s")
+    print(f"device requests:    {requests}")
+    print(f"threads:            {threads_before} before, {sampler.peak} peak, {executor_jobs} executor jobs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--displays", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5, help="polls per display")
+    parser.add_argument("--concurrency", type=int, default=8, help="displays polled at once")
+    parser.add_argument("--burst", type=int, default=20, help="volume commands per display")
+    add_simulator_arguments(parser)
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,196 @@
+"""Decode SICP captures and replay them against the coordinator.
+
+Captures are written by the integration when the capture option of an
+entry is enabled. `decode` prints every frame with its timing, `serve`
+answers requests with the replies recorded for them (at the recorded
+latency) on top of `sicp_simulator`, and `replay` polls a
+SicpUpdateCoordinator against such a display and prints what it reads.
+Needs Home Assistant installed and is run from the repository root:
+
+    python tools/sicp_replay.py decode config/iiyama_sicp/<entry_id>.sicpcap
+    python tools/sicp_replay.py replay config/iiyama_sicp/<entry_id>.sicpcap --polls 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import binascii
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from benchmark import create_coordinator  # noqa: E402
+from custom_components.iiyama_sicp.capture import DIRECTION_SENT, CaptureRecord, read_capture  # noqa: E402
+from custom_components.iiyama_sicp.sicp import CMD_ACK, COMMAND_NAMES, SicpError, decode_frame  # noqa: E402
+from sicp_simulator import SicpSimulator, SimulatedDisplay  # noqa: E402
+
+
+@dataclass
+class Exchange:
+    """A request and its reply, if one arrived."""
+
+    request: CaptureRecord
+    reply: CaptureRecord | None = None
+
+    @property
+    def command(self) -> int:
+        return self.request.frame[7]
+
+    @property
+    def data(self) -> bytes:
+        return bytes(self.request.frame[8:-1])
+
+    @property
+    def latency(self) -> float | None:
+        return self.reply.timestamp - self.request.timestamp if self.reply else None
+
+
+def pair_frames(records: list[CaptureRecord]) -> tuple[list[Exchange], list[CaptureRecord]]:
+    """Match replies to requests like the connection does; returns exchanges and pushed frames."""
+    exchanges = []
+    pending: deque[Exchange] = deque()
+    pushed = []
+    for record in records:
+        if record.direction == DIRECTION_SENT:
+            exchange = Exchange(record)
+            exchanges.append(exchange)
+            pending.append(exchange)
+            continue
+        try:
+            frame = decode_frame(record.frame)
+        except SicpError:
+            pushed.append(record)
+            continue
+        match = next((i for i, e in enumerate(pending) if frame.command in (CMD_ACK, e.command)), None)
+        if match is None:
+            pushed.append(record)
+            continue
+        # Requests before the matching one timed out without a reply
+        for _ in range(match):
+            pending.popleft()
+        pending.popleft().reply = record
+    return exchanges, pushed
+
+
+def _name(command: int) -> str:
+    return COMMAND_NAMES.get(command, "0x%02x" % command)
+
+
+def decode(path: str):
+    host, records = read_capture(path)
+    exchanges, pushed = pair_frames(records)
+    start = records[0].timestamp if records else 0.0
+    print(f"{host}: {len(records)} frames, {len(exchanges)} requests, {len(pushed)} pushed")
+    lines = []
+    for exchange in exchanges:
+        line = (f"{exchange.request.timestamp - start:10.3f}s  {_name(exchange.command):<22}"
+                f"{binascii.hexlify(exchange.data, ' ').decode():<12}")
+        if exchange.reply is None:
+            line += "  no reply"
+        else:
+            try:
+                frame = decode_frame(exchange.reply.frame)
+                reply = "ack" if frame.command == CMD_ACK else _name(frame.command)
+                line += f"  -> {reply} {binascii.hexlify(frame.data, ' ').decode()}"
+            except SicpError as e:
+                line += f"  -> {e}"
+            line += f"  {exchange.latency * 1000:.1f} ms"
+        lines.append((exchange.request.timestamp, line))
+    for record in pushed:
+        lines.append((record.timestamp, f"{record.timestamp - start:10.3f}s  pushed  "
+                                        f"{binascii.hexlify(record.frame, ' ').decode()}"))
+    for _, line in sorted(lines, key=lambda item: item[0]):
+        print(line)
+
+
+class ReplayDisplay(SimulatedDisplay):
+    """Simulated display answering each request with the replies recorded for it, in order.
+
+    Requests not in the capture are answered by the simulator itself.
+    """
+
+    def __init__(self, exchanges: list[Exchange], **kwargs):
+        latencies = defaultdict(list)
+        replies = defaultdict(deque)
+        for exchange in exchanges:
+            reply = None
+            if exchange.reply is not None:
+                frame = decode_frame(exchange.reply.frame)
+                reply = (frame.command, frame.data)
+                latencies[exchange.command].append(exchange.latency)
+            replies[(exchange.command, exchange.data)].append(reply)
+        kwargs.setdefault("command_latency", {c: statistics.median(v) for c, v in latencies.items()})
+        super().__init__(**kwargs)
+        self._recorded = replies
+
+    def handle(self, command: int, data: bytes) -> tuple[int, bytes] | None:
+        replies = self._recorded.get((command, data))
+        if not replies:
+            return super().handle(command, data)
+        # Cycle through the recorded replies so long replays keep going
+        replies.rotate(-1)
+        return replies[-1]
+
+
+async def serve(path: str, host: str, port: int):
+    _, records = read_capture(path)
+    exchanges, _ = pair_frames(records)
+    async with SicpSimulator([ReplayDisplay(exchanges, port=port)], host):
+        logging.getLogger(__name__).info("Replaying %s on %s:%d", path, host, port)
+        await asyncio.Event().wait()
+
+
+async def replay(path: str, host: str, port: int, polls: int):
+    _, records = read_capture(path)
+    exchanges, _ = pair_frames(records)
+    display = ReplayDisplay(exchanges, port=port)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        async with SicpSimulator([display], host):
+            coordinator = create_coordinator(hass, host, port, 0)
+            await coordinator.async_restore()
+            latencies = []
+            for poll in range(polls):
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                latencies.append(time.perf_counter() - start)
+                status = coordinator.data if coordinator.last_update_success else coordinator.last_exception
+                print(f"poll {poll + 1:3}: {latencies[-1] * 1000:7.1f} ms  {status}")
+            await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    print(f"requests: {display.requests}, mean poll {statistics.mean(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="action", required=True)
+    subparsers.add_parser("decode", help="print the frames of a capture").add_argument("capture")
+    for action, help_ in (("serve", "serve a display answering like the captured one"),
+                          ("replay", "poll a coordinator against the captured display")):
+        subparser = subparsers.add_parser(action, help=help_)
+        subparser.add_argument("capture")
+        subparser.add_argument("--host", default="127.0.0.1")
+        subparser.add_argument("--port", type=int, default=15000)
+        if action == "replay":
+            subparser.add_argument("--polls", type=int, default=10)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING if args.action == "replay" else logging.INFO)
+    try:
+        if args.action == "decode":
+            decode(args.capture)
+        elif args.action == "serve":
+            asyncio.run(serve(args.capture, args.host, args.port))
+        else:
+            asyncio.run(replay(args.capture, args.host, args.port, args.polls))
+    except KeyboardInterrupt:
+        pass
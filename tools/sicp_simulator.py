@@ -0,0 +1,326 @@
+"""Local simulator of iiyama displays speaking SICP over TCP.
+
+Implements the commands used by the integration (power, input source,
+volume, model number, firmware and platform version, temperature, video
+parameters, signal status and operating hours) independently of the
+integration's own protocol code, with configurable per-command latency,
+packet loss and power-off behaviour. Hundreds of displays can be served
+from one process, each on its own port.
+
+    python tools/sicp_simulator.py --count 50 --base-port 15000 --latency 0.02
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import logging
+import operator
+import random
+from dataclasses import dataclass, field
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUEST_HEADER = 0xA6
+REPLY_HEADER = 0x21
+
+ACK = 0x00
+LIMIT_OVER_UPPER = 0x01
+NAV = 0x03
+NACK = 0x04
+
+POWER_OFF = 0x01
+POWER_ON = 0x02
+
+WOL_PORT = 9
+
+
+def _checksum(data: bytes) -> int:
+    return functools.reduce(operator.xor, data, 0)
+
+
+def _reply(monitor_id: int, command: int, data: bytes = b'') -> bytes:
+    body = bytes([0x01, command]) + data
+    frame = bytes([REPLY_HEADER, monitor_id, 0x00, 0x00, len(body) + 1]) + body
+    return frame + bytes([_checksum(frame)])
+
+
+@dataclass
+class SimulatedDisplay:
+    """State and behaviour of one simulated display."""
+
+    port: int
+    mac: str = "00:00:00:00:00:00"
+    model: str = "LH4370UHB-B1"
+    fw_version: str = "FW 1.0.3"
+    platform_version: str = "A10 2.1"
+    monitor_id: int = 0x01
+    power: bool = True
+    source: int = 0x0D
+    volume: int = 30
+    temperature: int = 38
+    brightness: int = 70
+    signal: bool = True
+    operating_hours: int = 1234
+    # Seconds before a reply is sent, per command byte and for all other commands
+    latency: float = 0.0
+    command_latency: dict[int, float] = field(default_factory=dict)
+    # Probability that a request is silently dropped
+    loss: float = 0.0
+    # Whether SICP keeps answering while off; if not, the display drops off the network
+    network_standby: bool = True
+    # Seconds between a wake up (magic packet or power on) and accepting connections
+    boot_time: float = 0.0
+    # Whether changes made with `remote` are reported to connected clients
+    push: bool = False
+    requests: int = 0
+    _writers: set = field(default_factory=set, repr=False)
+    _booting_until: float = field(default=0.0, repr=False)
+    _host: str | None = field(default=None, repr=False)
+    _server: asyncio.Server | None = field(default=None, repr=False)
+    _listen_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    _listen_tasks: set = field(default_factory=set, repr=False)
+
+    @property
+    def reachable(self) -> bool:
+        if asyncio.get_running_loop().time() < self._booting_until:
+            return False
+        return self.power or self.network_standby
+
+    def wake(self):
+        if not self.power:
+            self.power = True
+            self._booting_until = asyncio.get_running_loop().time() + self.boot_time
+            asyncio.get_running_loop().call_later(self.boot_time, self.update_listening)
+            self.update_listening()
+
+    def power_off(self):
+        self.power = False
+        self.update_listening()
+
+    async def async_start(self, host: str):
+        self._host = host
+        await self._async_update_listening()
+
+    async def async_stop(self):
+        self._host = None
+        await self._async_update_listening()
+        for writer in list(self._writers):
+            writer.close()
+
+    def update_listening(self):
+        """Listen for connections only while reachable, so connects are refused otherwise."""
+        task = asyncio.get_running_loop().create_task(self._async_update_listening())
+        self._listen_tasks.add(task)
+        task.add_done_callback(self._listen_tasks.discard)
+
+    async def _async_update_listening(self):
+        async with self._listen_lock:
+            listen = self._host is not None and self.reachable
+            if listen and self._server is None:
+                self._server = await asyncio.start_server(self.serve, self._host, self.port)
+            elif not listen and self._server is not None:
+                self._server.close()
+                self._server = None
+
+    def remote(self, power: bool | None = None, source: int | None = None, volume: int | None = None):
+        """Change the state like the IR remote does, reporting it if `push` is set."""
+        reports = []
+        if power is not None:
+            if power:
+                self.wake()
+            else:
+                self.power_off()
+            reports.append((0x19, bytes([POWER_ON if power else POWER_OFF])))
+        if source is not None:
+            self.source = source
+            reports.append((0xAD, bytes([source, 0x00, 0x00, 0x00])))
+        if volume is not None:
+            self.volume = volume
+            reports.append((0x45, bytes([volume, volume])))
+        if not self.push:
+            return
+        for writer in self._writers:
+            for command, data in reports:
+                writer.write(_reply(self.monitor_id, command, data))
+
+    def handle(self, command: int, data: bytes) -> tuple[int, bytes] | None:
+        """Return (reply command, reply data) for one request, None to not answer it."""
+        if command == 0x19:
+            return command, bytes([POWER_ON if self.power else POWER_OFF])
+        if command == 0x18:
+            if data[:1] == bytes([POWER_ON]):
+                self.wake()
+            elif data[:1] == bytes([POWER_OFF]):
+                self.power_off()
+            else:
+                return ACK, bytes([NAV])
+            return ACK, bytes([ACK])
+        if command == 0xA1 and data[:1] == b'\x00':
+            return command, self.model.encode()
+        if command == 0xA1 and data[:1] == b'\x01':
+            return command, self.fw_version.encode()
+        if command == 0xA2 and data[:1] == b'\x02':
+            return command, self.platform_version.encode()
+        if command == 0x0F and data[:1] == b'\x02':
+            return command, self.operating_hours.to_bytes(2, 'big')
+        if not self.power:
+            return ACK, bytes([NAV])
+        if command == 0x45:
+            return command, bytes([self.volume, self.volume])
+        if command == 0x44:
+            if not data or data[0] > 100:
+                return ACK, bytes([LIMIT_OVER_UPPER])
+            self.volume = data[0]
+            return ACK, bytes([ACK])
+        if command == 0x2F:
+            return command, bytes([self.temperature])
+        if command == 0x33:
+            # Brightness, colour, contrast, sharpness, tint, black level, gamma
+            return command, bytes([self.brightness, 50, 50, 50, 50, 50, 0x01])
+        if command == 0x59:
+            return command, bytes([0x01 if self.signal else 0x00])
+        if command == 0xAD:
+            return command, bytes([self.source, 0x00, 0x00, 0x00])
+        if command == 0xAC:
+            if not data:
+                return ACK, bytes([NAV])
+            self.source = data[0]
+            return ACK, bytes([ACK])
+        return ACK, bytes([NAV])
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if not self.reachable:
+            writer.close()
+            return
+        self._writers.add(writer)
+        try:
+            while True:
+                head = await reader.readexactly(6)
+                body = await reader.readexactly(head[5])
+                self.requests += 1
+                frame = head + body
+                if head[0] != REQUEST_HEADER or _checksum(frame[:-1]) != frame[-1]:
+                    writer.write(_reply(head[1], ACK, bytes([NACK])))
+                    continue
+                if random.random() < self.loss:
+                    continue
+                command, data = body[1], bytes(body[2:-1])
+                delay = self.command_latency.get(command, self.latency)
+                if delay:
+                    await asyncio.sleep(delay)
+                reply = self.handle(command, data)
+                if reply is not None:
+                    writer.write(_reply(head[1], *reply))
+                if not self.reachable:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+class _WakeOnLanProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, displays: dict[str, SimulatedDisplay]):
+        self._displays = displays
+
+    def datagram_received(self, data: bytes, addr):
+        if len(data) >= 102 and data[:6] == b'\xff' * 6:
+            display = self._displays.get(data[6:12].hex())
+            if display is not None:
+                display.wake()
+
+
+class SicpSimulator:
+    """Serve many simulated displays on consecutive ports of one host."""
+
+    def __init__(self, displays: list[SimulatedDisplay], host: str = "127.0.0.1", wol_port: int | None = None):
+        self.host = host
+        self.displays = displays
+        self._wol_port = wol_port
+        self._wol_transport = None
+
+    @classmethod
+    def create(cls, count: int, base_port: int, host: str = "127.0.0.1", wol_port: int | None = None,
+               **kwargs) -> SicpSimulator:
+        displays = [SimulatedDisplay(port=base_port + i, mac=":".join(f"{b:02x}" for b in (0x02, 0, 0, 0) +
+                                                                       divmod(i, 256)), **kwargs)
+                    for i in range(count)]
+        return cls(displays, host, wol_port)
+
+    async def start(self):
+        for display in self.displays:
+            await display.async_start(self.host)
+        if self._wol_port is not None:
+            by_mac = {d.mac.replace(":", "").lower(): d for d in self.displays}
+            self._wol_transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: _WakeOnLanProtocol(by_mac), local_addr=(self.host, self._wol_port))
+
+    async def stop(self):
+        for display in self.displays:
+            await display.async_stop()
+        if self._wol_transport is not None:
+            self._wol_transport.close()
+
+    async def __aenter__(self) -> SicpSimulator:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+def _command_latency(values: list[str]) -> dict[int, float]:
+    result = {}
+    for value in values:
+        command, latency = value.split("=")
+        result[int(command, 0)] = float(latency)
+    return result
+
+
+def add_simulator_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=15000)
+    parser.add_argument("--latency", type=float, default=0.0, help="reply delay in seconds")
+    parser.add_argument("--command-latency", action="append", default=[], metavar="CMD=SECONDS",
+                        help="reply delay of one command, e.g. 0x19=0.2")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability of dropping a request")
+    parser.add_argument("--off", action="store_true", help="start the displays powered off")
+    parser.add_argument("--no-network-standby", action="store_true",
+                        help="displays refuse connections while off")
+    parser.add_argument("--boot-time", type=float, default=0.0, help="seconds from wake up to accepting connections")
+    parser.add_argument("--push", action="store_true", help="report changes made with the remote to clients")
+
+
+def simulator_kwargs(args: argparse.Namespace) -> dict:
+    return {
+        "latency": args.latency,
+        "command_latency": _command_latency(args.command_latency),
+        "loss": args.loss,
+        "power": not args.off,
+        "network_standby": not args.no_network_standby,
+        "boot_time": args.boot_time,
+        "push": args.push,
+    }
+
+
+async def _main(args: argparse.Namespace):
+    simulator = SicpSimulator.create(args.count, args.base_port, args.host, args.wol_port, **simulator_kwargs(args))
+    async with simulator:
+        _LOGGER.info("Serving %d displays on %s:%d-%d", args.count, args.host, args.base_port,
+                     args.base_port + args.count - 1)
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1, help="number of displays")
+    parser.add_argument("--wol-port", type=int, default=None, help="UDP port to listen for magic packets on")
+    add_simulator_arguments(parser)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass